@@ -21,6 +21,13 @@ if config.config_file_name is not None:
 from app.db.base import Base
 from app.models import user
 from app.models import note
+from app.models import ingestion_job
+from app.models import note_chunk
+from app.models import ai_note
+from app.models import challenge
+from app.models import demand_log
+from app.models import embedding_migration
+from app.models import file_blob
 target_metadata = Base.metadata
 # other values from the config, defined by the needs of env.py,# can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -0,0 +1,35 @@
+"""add notes binary quantized index
+
+Revision ID: 0b9e3d5f7a2c
+Revises: f2b8c6d4a9e1
+Create Date: 2026-10-18 18:12:33.402715
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0b9e3d5f7a2c'
+down_revision: Union[str, Sequence[str], None] = 'f2b8c6d4a9e1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Expression index for NOTE_RETRIEVAL=binary (requires pgvector >= 0.7)
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_notes_embedding_bit_hnsw "
+            "ON notes USING hnsw ((binary_quantize(embedding)::bit(384)) bit_hamming_ops) "
+            "WITH (m = 16, ef_construction = 64)"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_notes_embedding_bit_hnsw")
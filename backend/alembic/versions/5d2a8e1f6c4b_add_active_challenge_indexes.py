@@ -0,0 +1,38 @@
+"""add active challenge indexes
+
+Revision ID: 5d2a8e1f6c4b
+Revises: 1c7f4a9b3e6d
+Create Date: 2026-10-18 19:21:40.083516
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d2a8e1f6c4b'
+down_revision: Union[str, Sequence[str], None] = '1c7f4a9b3e6d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_challenges_active_reward "
+            "ON challenges (reward_credits DESC, id) WHERE is_active"
+        )
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_challenges_active_topic_prefix "
+            "ON challenges (topic_key text_pattern_ops) WHERE is_active"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_challenges_active_topic_prefix")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_challenges_active_reward")
@@ -0,0 +1,40 @@
+"""add note search filter indexes
+
+Revision ID: 7e3b5c9a1d2f
+Revises: 5d2a8e1f6c4b
+Create Date: 2026-10-18 20:02:13.514872
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7e3b5c9a1d2f'
+down_revision: Union[str, Sequence[str], None] = '5d2a8e1f6c4b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_notes_public_subject_created_at "
+            "ON notes (subject, created_at) "
+            "WHERE is_private = false AND status = 'ready'"
+        )
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_notes_public_user_created_at "
+            "ON notes (user_id, created_at) "
+            "WHERE is_private = false AND status = 'ready'"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_notes_public_user_created_at")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_notes_public_subject_created_at")
@@ -0,0 +1,38 @@
+"""add notes embedding hnsw index
+
+Revision ID: a3c1f9e2b7d4
+Revises: 6906939d3f47
+Create Date: 2026-10-18 15:02:11.204318
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3c1f9e2b7d4'
+down_revision: Union[str, Sequence[str], None] = '6906939d3f47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS vector")
+
+    # Built concurrently so uploads keep working while the graph is built;
+    # use `python -m scripts.rebuild_vector_index` to change m / ef_construction.
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_notes_embedding_hnsw "
+            "ON notes USING hnsw (embedding vector_cosine_ops) "
+            "WITH (m = 16, ef_construction = 64)"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_notes_embedding_hnsw")
@@ -0,0 +1,56 @@
+"""add note ingestion jobs
+
+Revision ID: c5e8d2a4f1b6
+Revises: a3c1f9e2b7d4
+Create Date: 2026-10-18 15:40:27.918344
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5e8d2a4f1b6'
+down_revision: Union[str, Sequence[str], None] = 'a3c1f9e2b7d4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Columns already written by upload_note; may exist on tables that
+    # were created with Base.metadata.create_all
+    op.execute("ALTER TABLE notes ADD COLUMN IF NOT EXISTS description TEXT DEFAULT ''")
+    op.execute("ALTER TABLE notes ADD COLUMN IF NOT EXISTS content_type VARCHAR")
+    op.execute("ALTER TABLE notes ADD COLUMN IF NOT EXISTS user_id INTEGER REFERENCES users (id)")
+    op.execute("CREATE INDEX IF NOT EXISTS ix_notes_user_id ON notes (user_id)")
+
+    op.add_column('notes', sa.Column('status', sa.String(length=20), server_default='ready', nullable=False))
+    op.add_column('notes', sa.Column('processing_error', sa.Text(), nullable=True))
+    op.add_column('notes', sa.Column('extracted_text', sa.Text(), nullable=True))
+
+    op.create_table('ingestion_jobs',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('note_id', sa.UUID(), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('locked_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['note_id'], ['notes.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('note_id')
+    )
+    op.create_index(op.f('ix_ingestion_jobs_status'), 'ingestion_jobs', ['status'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_ingestion_jobs_status'), table_name='ingestion_jobs')
+    op.drop_table('ingestion_jobs')
+    op.drop_column('notes', 'extracted_text')
+    op.drop_column('notes', 'processing_error')
+    op.drop_column('notes', 'status')
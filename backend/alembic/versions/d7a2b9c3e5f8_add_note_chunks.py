@@ -0,0 +1,47 @@
+"""add note chunks
+
+Revision ID: d7a2b9c3e5f8
+Revises: c5e8d2a4f1b6
+Create Date: 2026-10-18 16:21:45.530192
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from pgvector.sqlalchemy import Vector
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd7a2b9c3e5f8'
+down_revision: Union[str, Sequence[str], None] = 'c5e8d2a4f1b6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('note_chunks',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('note_id', sa.UUID(), nullable=False),
+    sa.Column('chunk_index', sa.Integer(), nullable=False),
+    sa.Column('content', sa.Text(), nullable=False),
+    sa.Column('embedding', Vector(384), nullable=False),
+    sa.ForeignKeyConstraint(['note_id'], ['notes.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_note_chunks_note_id'), 'note_chunks', ['note_id'], unique=False)
+
+    # Empty table, so no need to build concurrently
+    op.execute(
+        "CREATE INDEX ix_note_chunks_embedding_hnsw "
+        "ON note_chunks USING hnsw (embedding vector_cosine_ops) "
+        "WITH (m = 16, ef_construction = 64)"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_note_chunks_embedding_hnsw', table_name='note_chunks')
+    op.drop_index(op.f('ix_note_chunks_note_id'), table_name='note_chunks')
+    op.drop_table('note_chunks')
@@ -0,0 +1,33 @@
+"""add demand logs topic index
+
+Revision ID: f2b8c6d4a9e1
+Revises: e4f6a1c8b2d9
+Create Date: 2026-10-18 17:38:50.117263
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2b8c6d4a9e1'
+down_revision: Union[str, Sequence[str], None] = 'e4f6a1c8b2d9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_demand_logs_topic_key_search_date "
+            "ON demand_logs (topic_key, search_date)"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_demand_logs_topic_key_search_date")
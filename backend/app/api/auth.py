@@ -1,20 +1,39 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from sqlalchemy import func
 
 from app.db.session import get_db
 from app.models.user import User
 from app.schemas.auth import UserCreate, UserLogin, Token
-from app.core.security import verify_password, hash_password
+from app.core.security import (
+    HashingPoolSaturated,
+    hash_password_async,
+    verify_password_async
+)
 from app.core.jwt import create_access_token
 from app.dependencies.auth import get_current_user
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
 
+def _hashing_busy():
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Server is busy, please retry shortly",
+        headers={"Retry-After": "1"}
+    )
+
+
+def _find_user(db: Session, *criteria):
+    return db.query(User).filter(*criteria).first()
+
+
+# login / register are async so bcrypt runs on the dedicated hashing
+# pool; database calls still go through the threadpool.
 @router.post("/login", response_model=Token)
-def login(user_in: UserLogin, db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.email == user_in.email).first()
+async def login(user_in: UserLogin, db: Session = Depends(get_db)):
+    user = await run_in_threadpool(_find_user, db, User.email == user_in.email)
 
     if not user:
         raise HTTPException(
@@ -28,16 +47,24 @@ def login(user_in: UserLogin, db: Session = Depends(get_db)):
             detail="Account is disabled"
         )
 
-    if not verify_password(user_in.password, user.hashed_password):
+    try:
+        valid = await verify_password_async(user_in.password, user.hashed_password)
+    except HashingPoolSaturated:
+        raise _hashing_busy()
+
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid credentials"
         )
 
+    # Read before commit expires the instance
+    email = user.email
+
     user.last_login_at = func.now()
-    db.commit()
+    await run_in_threadpool(db.commit)
 
-    access_token = create_access_token({"sub": user.email})
+    access_token = create_access_token(email)
 
     return {
         "access_token": access_token,
@@ -55,11 +82,11 @@ def get_me(current_user: User = Depends(get_current_user)):
 
 
 @router.post("/register", status_code=201)
-def register(user_in: UserCreate, db: Session = Depends(get_db)):
+async def register(user_in: UserCreate, db: Session = Depends(get_db)):
 
-    existing_email = db.query(User).filter(
-        User.email == user_in.email
-    ).first()
+    existing_email = await run_in_threadpool(
+        _find_user, db, User.email == user_in.email
+    )
 
     if existing_email:
         raise HTTPException(
@@ -67,9 +94,9 @@ def register(user_in: UserCreate, db: Session = Depends(get_db)):
             detail="Email already registered"
         )
 
-    existing_username = db.query(User).filter(
-        User.username == user_in.username
-    ).first()
+    existing_username = await run_in_threadpool(
+        _find_user, db, User.username == user_in.username
+    )
 
     if existing_username:
         raise HTTPException(
@@ -77,7 +104,10 @@ def register(user_in: UserCreate, db: Session = Depends(get_db)):
             detail="Username already taken"
         )
 
-    hashed_pw = hash_password(user_in.password)
+    try:
+        hashed_pw = await hash_password_async(user_in.password)
+    except HashingPoolSaturated:
+        raise _hashing_busy()
 
     new_user = User(
         email=user_in.email,
@@ -87,7 +117,6 @@ def register(user_in: UserCreate, db: Session = Depends(get_db)):
     )
 
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await run_in_threadpool(db.commit)
 
     return {"message": "User registered successfully"}
@@ -1,46 +1,49 @@
+from typing import Optional
+
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 
-from app.db.session import get_db
+from app.core.config import CHALLENGE_PAGE_SIZE, CHALLENGE_MAX_PAGE_SIZE
+from app.db.session import get_async_db, get_db
 from app.models.challenge import Challenge
 from app.models.challenge_submission import ChallengeSubmission
 from app.models.note import Note
 from app.models.user import User
 from app.dependencies.auth import get_current_user
+from app.services.challenge_listing import (
+    InvalidCursor,
+    invalidate_challenge_listing,
+    list_challenges
+)
 
 
 router = APIRouter(prefix="/challenges", tags=["Challenges"])
 
 
 # -----------------------------
-# Get all active challenges
+# List active challenges (keyset paginated)
 # -----------------------------
 @router.get("/")
-def list_active_challenges(db: Session = Depends(get_db)):
-
-    challenges = (
-        db.query(Challenge)
-        .filter(Challenge.is_active == True)
-        .order_by(Challenge.reward_credits.desc())
-        .all()
-    )
+async def list_active_challenges(
+    limit: int = CHALLENGE_PAGE_SIZE,
+    cursor: Optional[str] = None,
+    topic_prefix: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
 
-    results = []
+    if limit < 1 or limit > CHALLENGE_MAX_PAGE_SIZE:
+        raise HTTPException(
+            status_code=400,
+            detail=f"limit must be between 1 and {CHALLENGE_MAX_PAGE_SIZE}"
+        )
 
-    for c in challenges:
-        results.append({
-            "challenge_id": str(c.id),
-            "topic_key": c.topic_key,
-            "reward_credits": c.reward_credits,
-            "demand_count": c.demand_count,
-            "days_active": c.days_active
-        })
+    try:
+        return await list_challenges(db, limit, cursor, topic_prefix)
 
-    return {
-        "total": len(results),
-        "challenges": results
-    }
+    except InvalidCursor:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
 
 
 # -----------------------------
@@ -163,6 +166,9 @@ def approve_submission(
 
     db.commit()
 
+    # closed challenge leaves the board
+    invalidate_challenge_listing()
+
     return {
         "message": "Submission approved",
         "reward_given": challenge.reward_credits,
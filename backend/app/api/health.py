@@ -0,0 +1,25 @@
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+from app.services.readiness import readiness
+
+
+router = APIRouter(prefix="/health", tags=["Health"])
+
+
+@router.get("/live")
+def liveness():
+    # The process is up and serving; says nothing about dependencies
+    return {"status": "ok"}
+
+
+@router.get("/ready")
+def readiness_check():
+    # Route traffic here only once both DB pools are primed and the
+    # embedding model is loaded and warm
+    status = readiness.status()
+
+    if not readiness.ready:
+        return JSONResponse(status_code=503, content=status)
+
+    return status
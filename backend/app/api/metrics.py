@@ -0,0 +1,19 @@
+from fastapi import APIRouter
+
+from app.core.security import hashing_pool
+from app.db.session import pool_stats
+from app.ml.note_index import note_index
+from app.services.search_cache import search_cache
+
+
+router = APIRouter(prefix="/metrics", tags=["Metrics"])
+
+
+@router.get("/")
+def get_metrics():
+    return {
+        "hashing": hashing_pool.stats(),
+        "db_pool": pool_stats(),
+        "search_cache": search_cache.stats() if search_cache is not None else None,
+        "note_index": note_index.stats() if note_index is not None else None
+    }
@@ -1,22 +1,25 @@
 import os
-import shutil
-import uuid
+from typing import List
 
 from fastapi import APIRouter, UploadFile, File, Form, Depends, HTTPException
 from fastapi.responses import FileResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.db.session import get_db
+from app.core.config import UPLOAD_DIR, BULK_IMPORT_MAX_FILES
+from app.db.session import get_async_db, get_db
 from app.models.note import Note
 from app.models.user import User
-from app.dependencies.auth import get_current_user
-from app.ml.embedding_model import generate_embedding
-from app.utils.pdf_utils import extract_text_from_pdf
+from app.dependencies.auth import get_current_user, get_current_user_async
+from app.services.blob_store import UploadTooLarge, discard_incoming, receive_file, retain_blob
+from app.services.bulk_import import ImportOptions, import_result, queue_files
+from app.services.ingestion import enqueue_note
+from app.services.note_counters import note_counters
 
 
 router = APIRouter(prefix="/notes", tags=["Notes"])
 
-UPLOAD_DIR = "uploads"
 os.makedirs(UPLOAD_DIR, exist_ok=True)
 
 
@@ -39,30 +42,16 @@ def upload_note(
     if not file.content_type or "pdf" not in file.content_type:
         raise HTTPException(status_code=400, detail="Only PDF files allowed")
 
-    unique_name = f"{uuid.uuid4()}_{file.filename}"
-    file_path = os.path.join(UPLOAD_DIR, unique_name)
-
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
-
-    
     try:
-        note_text = extract_text_from_pdf(file_path)
-    except Exception:
-        os.remove(file_path)
-        raise HTTPException(status_code=400, detail="Failed to extract PDF text")
-
-    if not note_text.strip():
-        os.remove(file_path)
-        raise HTTPException(status_code=400, detail="PDF contains no readable text")
-
-   
-    note_text = note_text[:5000]
+        stored = receive_file(file.file, file.filename)
+    except UploadTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
 
-   
-    embedding = generate_embedding(title + " " + description + " " + note_text)
+    # Identical files share one stored copy
+    stored = retain_blob(db, stored)
 
-  
+    # Text extraction and embedding happen in the ingestion workers (or
+    # are copied from an earlier upload of the same file)
     note = Note(
         title=title,
         description=description,
@@ -70,28 +59,96 @@ def upload_note(
         content_type=content_type,
         is_private=is_private,
         file_type=file.content_type,
-        file_path=file_path,
-        file_size=os.path.getsize(file_path),
+        file_path=stored.file_path,
+        file_size=stored.file_size,
+        content_hash=stored.content_hash,
         user_id=current_user.id,
-        embedding=embedding,
+        status="processing",
         view_count=0,
         download_count=0,
         upvotes=0
     )
 
     db.add(note)
+    db.flush()
+
+    enqueue_note(db, note)
+
     db.commit()
-    db.refresh(note)
 
     return {
         "message": "Uploaded successfully",
-        "note_id": str(note.id)
+        "note_id": str(note.id),
+        "status": note.status
     }
 
 
 
-@router.get("/{note_id}/view")
-def view_note(
+@router.post("/bulk-upload")
+def bulk_upload_notes(
+    subject: str = Form(...),
+    content_type: str = Form(...),
+    description: str = Form(""),
+    is_private: bool = Form(True),
+    files: List[UploadFile] = File(...),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+
+    if len(files) > BULK_IMPORT_MAX_FILES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {BULK_IMPORT_MAX_FILES} files per request"
+        )
+
+    results = []
+    stored_files = []
+
+    try:
+        for file in files:
+            if not file.filename:
+                results.append(import_result("", "failed", error="File missing"))
+                continue
+
+            if not file.content_type or "pdf" not in file.content_type:
+                results.append(import_result(file.filename, "failed", error="Only PDF files allowed"))
+                continue
+
+            try:
+                stored_files.append(receive_file(file.file, file.filename))
+            except UploadTooLarge as e:
+                results.append(import_result(file.filename, "failed", error=str(e)))
+
+        # One multi-row insert for the notes and one for their ingestion
+        # jobs; files this user already uploaded are reported as skipped
+        results.extend(queue_files(
+            db,
+            stored_files,
+            current_user.id,
+            ImportOptions(subject, content_type, description, is_private)
+        ))
+
+        db.commit()
+
+    except Exception:
+        # Blobs already moved into place go with the rollback; this drops
+        # the incoming copies that weren't retained
+        db.rollback()
+
+        for stored in stored_files:
+            discard_incoming(stored)
+
+        raise
+
+    return {
+        "queued": sum(1 for r in results if r["status"] == "queued"),
+        "results": results
+    }
+
+
+
+@router.get("/{note_id}/status")
+def note_status(
     note_id: str,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
@@ -102,11 +159,57 @@ def view_note(
     if not note:
         raise HTTPException(status_code=404, detail="Note not found")
 
+    if note.user_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Not authorized")
+
+    return {
+        "note_id": str(note.id),
+        "status": note.status,
+        "error": note.processing_error
+    }
+
+
+
+async def _get_note_access(db: AsyncSession, note_id: str):
+    # Only the columns needed for access checks and serving the file;
+    # counters are buffered and flushed in batches by note_counters
+    note = (await db.execute(
+        select(
+            Note.id,
+            Note.title,
+            Note.is_private,
+            Note.user_id,
+            Note.file_path,
+            Note.file_type,
+            Note.status,
+            Note.upvotes
+        ).where(Note.id == note_id)
+    )).first()
+
+    if not note:
+        raise HTTPException(status_code=404, detail="Note not found")
+
+    return note
+
+
+
+@router.get("/{note_id}/view")
+async def view_note(
+    note_id: str,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
+):
+
+    note = await _get_note_access(db, note_id)
+
     if note.is_private and note.user_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not authorized")
 
-    note.view_count += 1
-    db.commit()
+    # A failed note's file has been released
+    if note.status == "failed":
+        raise HTTPException(status_code=410, detail="Note file is no longer available")
+
+    note_counters.increment(note.id, "view_count")
 
     return FileResponse(
         path=note.file_path,
@@ -116,51 +219,46 @@ def view_note(
 
 
 @router.get("/{note_id}/download")
-def download_note(
+async def download_note(
     note_id: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
 ):
 
-    note = db.query(Note).filter(Note.id == note_id).first()
-
-    if not note:
-        raise HTTPException(status_code=404, detail="Note not found")
+    note = await _get_note_access(db, note_id)
 
     if note.is_private and note.user_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not authorized")
 
-    note.download_count += 1
-    db.commit()
+    if note.status == "failed":
+        raise HTTPException(status_code=410, detail="Note file is no longer available")
+
+    note_counters.increment(note.id, "download_count")
 
     return FileResponse(
         path=note.file_path,
         media_type=note.file_type,
-        filename=os.path.basename(note.file_path),
+        filename=f"{note.title}.pdf",
         headers={"Content-Disposition": "attachment"}
     )
 
 
 
 @router.post("/{note_id}/upvote")
-def upvote_note(
+async def upvote_note(
     note_id: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
 ):
 
-    note = db.query(Note).filter(Note.id == note_id).first()
-
-    if not note:
-        raise HTTPException(status_code=404, detail="Note not found")
+    note = await _get_note_access(db, note_id)
 
     if note.is_private and note.user_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not authorized")
 
-    note.upvotes += 1
-    db.commit()
+    note_counters.increment(note.id, "upvotes")
 
     return {
         "message": "Upvoted successfully",
-        "total_upvotes": note.upvotes
+        "total_upvotes": note.upvotes + note_counters.pending(note.id, "upvotes")
     }
\ No newline at end of file
@@ -1,33 +1,91 @@
-from fastapi import APIRouter, Depends, HTTPException
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import text
-from sqlalchemy.exc import IntegrityError
-from datetime import date
-
-from app.db.session import get_db
-from app.ml.embedding_model import generate_embedding
-from app.models.demand_log import DemandLog
-from app.models.challenge import Challenge
-from app.dependencies.auth import get_current_user
+from urllib.parse import urlencode
+
+from app.db.session import SessionLocal, get_async_db, get_db
+from app.ml.embedding_model import canonicalize_query, generate_query_embedding
+from app.dependencies.auth import get_current_user, get_current_user_async
 from app.utils.topic_normalizer import normalize_topic
-from app.services.ai_notes import generate_ai_notes
+from app.services.ai_note_store import (
+    claim_ai_note,
+    get_ai_note,
+    refresh_ai_note,
+    serialize_ai_note
+)
+from app.services.active_model import get_active_model
+from app.services.demand_stats import record_demand
+from app.services.note_search import SEARCH_MODES, SearchFilters, search_notes
+from app.services.search_cache import read_corpus_version, search_cache
 
 
 router = APIRouter(prefix="/search", tags=["Search"])
 
-SIMILARITY_THRESHOLD = 0.40
-CANDIDATE_LIMIT = 100
 
-BASE_REWARD = 50
-DEMAND_WEIGHT = 5
-DAY_WEIGHT = 10
+async def _search(db: AsyncSession, query: str, mode: str, filters: SearchFilters, model_name: str):
+    # Generate embedding (cached for repeated queries)
+    query_embedding = await generate_query_embedding(query, model_name)
+
+    # Retrieve candidate notes
+    return await search_notes(db, query_embedding, mode, filters, model_name)
+
+
+def _record_miss(query: str, user_id):
+    # Writes on the sync session, run in the threadpool: only searches
+    # with no results get here
+    db = SessionLocal()
+
+    try:
+        # Normalize topic
+        topic_key = normalize_topic(query)
+
+        # Log demand and update the topic's challenge counters
+        challenge = record_demand(db, query, topic_key, user_id)
+
+        # Reuse the stored AI note for this topic; at most one request
+        # (across all workers) regenerates it, after the response is sent
+        ai_note, claimed = claim_ai_note(db, topic_key, query)
+
+        body = {
+            "query": query,
+            "results": [],
+            "ai_generated_note": serialize_ai_note(ai_note),
+            "ai_note_job": {
+                "topic_key": topic_key,
+                "status": ai_note.status,
+                "poll_url": "/search/ai-notes?" + urlencode({"topic_key": topic_key})
+            },
+            "challenge_available": True,
+            "challenge": {
+                "challenge_id": str(challenge.id),
+                "topic_key": challenge.topic_key,
+                "reward_credits": challenge.reward_credits,
+                "demand_count": challenge.demand_count,
+                "days_active": challenge.days_active
+            }
+        }
+
+        return body, topic_key, claimed
+
+    finally:
+        db.close()
 
 
 @router.get("/")
-def semantic_search(
+async def semantic_search(
     q: str,
-    db: Session = Depends(get_db),
-    current_user=Depends(get_current_user)
+    background_tasks: BackgroundTasks,
+    mode: str = "note",
+    subject: Optional[str] = None,
+    author_id: Optional[int] = None,
+    created_after: Optional[datetime] = None,
+    include_own_private: bool = False,
+    db: AsyncSession = Depends(get_async_db),
+    current_user=Depends(get_current_user_async)
 ):
 
     # Validate query
@@ -36,62 +94,56 @@ def semantic_search(
 
     query = q.strip()
 
-    # Generate embedding
-    query_embedding = generate_embedding(query)
+    if mode not in SEARCH_MODES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"mode must be one of: {', '.join(SEARCH_MODES)}"
+        )
 
-    # Retrieve candidate notes
-    result = db.execute(
-        text("""
-            SELECT
-                id,
-                title,
-                subject,
-                description,
-                user_id,
-                created_at,
-                upvotes,
-                view_count,
-                download_count,
-                embedding <=> :embedding AS distance,
-                1 - (embedding <=> :embedding) AS similarity
-            FROM notes
-            WHERE is_private = false
-            ORDER BY embedding <=> :embedding
-            LIMIT :limit
-        """),
-        {
-            "embedding": query_embedding,
-            "limit": CANDIDATE_LIMIT
-        }
+    filters = SearchFilters(
+        subject=subject,
+        author_id=author_id,
+        created_after=created_after,
+        owner_id=current_user.id if include_own_private else None
     )
 
-    rows = result.fetchall()
+    # Reuse results computed against the current corpus version. Private
+    # notes don't bump that version, so per-user results aren't cached.
+    candidates = None
+    cacheable = search_cache is not None and filters.owner_id is None
+
+    model_name = await get_active_model(db)
+
+    if cacheable:
+        cache_key = search_cache.make_key(
+            canonicalize_query(query),
+            model_name,
+            mode,
+            subject,
+            author_id,
+            created_after
+        )
+        corpus_version = await read_corpus_version(db)
+        # SQLite read: off the event loop, which may wait on its locks
+        candidates = await run_in_threadpool(search_cache.get, cache_key, corpus_version)
 
-    candidates = []
+    if candidates is None:
 
-    for row in rows:
+        candidates = await _search(db, query, mode, filters, model_name)
 
-        similarity = float(row.similarity)
+        # No rows can also mean the embedding model was just switched
+        if not candidates:
+            active_model = await get_active_model(db, refresh=True)
 
-        if similarity < SIMILARITY_THRESHOLD:
-            continue
+            if active_model != model_name:
+                candidates = await _search(db, query, mode, filters, active_model)
 
-        candidates.append({
-            "id": str(row.id),
-            "title": row.title,
-            "subject": row.subject,
-            "description": row.description,
-            "author_id": str(row.user_id),
-            "created_at": row.created_at,
-            "similarity": similarity,
-            "distance": float(row.distance),
-            "upvotes": row.upvotes,
-            "views": row.view_count,
-            "downloads": row.download_count
-        })
+        if cacheable:
+            await run_in_threadpool(search_cache.set, cache_key, candidates, corpus_version)
 
-    # If results exist return them
-    if candidates:
+    # If results exist return them. A filtered miss says nothing about
+    # demand for the topic itself.
+    if candidates or filters.active:
         return {
             "query": query,
             "candidate_count": len(candidates),
@@ -100,91 +152,28 @@ def semantic_search(
             "challenge_available": False
         }
 
-    # Normalize topic
-    topic_key = normalize_topic(query)
+    body, topic_key, claimed = await run_in_threadpool(_record_miss, query, current_user.id)
 
-    # Insert demand log
-    try:
-        demand = DemandLog(
-            query=query,
-            topic_key=topic_key,
-            user_id=current_user.id,
-            search_date=date.today()
-        )
+    if claimed:
+        background_tasks.add_task(refresh_ai_note, topic_key, query)
 
-        db.add(demand)
-        db.commit()
-
-    except IntegrityError:
-        db.rollback()
-
-    # Recalculate demand stats
-    stats = db.execute(
-        text("""
-            SELECT
-                COUNT(*) AS demand_count,
-                COUNT(DISTINCT search_date) AS days_active
-            FROM demand_logs
-            WHERE topic_key = :topic_key
-        """),
-        {"topic_key": topic_key}
-    ).fetchone()
-
-    demand_count = stats.demand_count
-    days_active = stats.days_active
-
-    # Calculate reward
-    reward = BASE_REWARD + (demand_count * DEMAND_WEIGHT) + (days_active * DAY_WEIGHT)
-
-    # Check existing challenge
-    challenge = db.query(Challenge).filter(
-        Challenge.topic_key == topic_key,
-        Challenge.is_active == True
-    ).first()
-
-    if challenge:
-        challenge.reward_credits = reward
-        challenge.demand_count = demand_count
-        challenge.days_active = days_active
-        db.commit()
-
-    else:
-        challenge = Challenge(
-            topic_key=topic_key,
-            reward_credits=reward,
-            demand_count=demand_count,
-            days_active=days_active,
-            is_active=True
-        )
+    return body
 
-        try:
-            db.add(challenge)
-            db.commit()
-            db.refresh(challenge)
 
-        except IntegrityError:
-            db.rollback()
+@router.get("/ai-notes")
+def get_ai_generated_note(
+    topic_key: str,
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user)
+):
 
-            challenge = db.query(Challenge).filter(
-                Challenge.topic_key == topic_key
-            ).first()
+    ai_note = get_ai_note(db, topic_key)
 
-    # Generate AI fallback note
-    try:
-        ai_note = generate_ai_notes(query)
-    except Exception:
-        ai_note = None
+    if ai_note is None:
+        raise HTTPException(status_code=404, detail="AI note not found")
 
     return {
-        "query": query,
-        "results": [],
-        "ai_generated_note": ai_note,
-        "challenge_available": True,
-        "challenge": {
-            "challenge_id": str(challenge.id),
-            "topic_key": challenge.topic_key,
-            "reward_credits": challenge.reward_credits,
-            "demand_count": challenge.demand_count,
-            "days_active": challenge.days_active
-        }
+        "topic_key": topic_key,
+        "status": ai_note.status,
+        "ai_generated_note": serialize_ai_note(ai_note)
     }
\ No newline at end of file
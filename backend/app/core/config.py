@@ -8,3 +8,137 @@ JWT_SECRET = os.getenv("JWT_SECRET")
 JWT_ALGORITHM = os.getenv("JWT_ALGORITHM")
 JWT_EXPIRE_MINUTES = int(os.getenv("JWT_EXPIRE_MINUTES"))
 
+# Database connection pools. DB_POOL_PROFILE picks a preset from
+# app.db.pool ("web", "worker", "pgbouncer" or "debug"); each of the
+# variables below overrides that preset only when it is set.
+DB_POOL_PROFILE = os.getenv("DB_POOL_PROFILE", "web")
+DB_POOL_SIZE = os.getenv("DB_POOL_SIZE")
+DB_MAX_OVERFLOW = os.getenv("DB_MAX_OVERFLOW")
+DB_POOL_TIMEOUT_SECONDS = os.getenv("DB_POOL_TIMEOUT_SECONDS")
+# "off", "statements" or "debug" (statements and result rows)
+DB_ECHO = os.getenv("DB_ECHO")
+# PgBouncer in transaction mode: no prepared statements or session state
+DB_PGBOUNCER = os.getenv("DB_PGBOUNCER")
+
+# pgvector HNSW index on notes.embedding
+HNSW_M = int(os.getenv("HNSW_M", "16"))
+HNSW_EF_CONSTRUCTION = int(os.getenv("HNSW_EF_CONSTRUCTION", "64"))
+# HNSW returns at most ef_search rows per scan, so keep it >= the search
+# candidate limit; raise it for recall, lower it for latency.
+HNSW_EF_SEARCH = int(os.getenv("HNSW_EF_SEARCH", "100"))
+# pgvector >= 0.8: keep scanning the graph until filtered searches have
+# enough rows ("strict_order", "relaxed_order" or "off")
+HNSW_ITERATIVE_SCAN = os.getenv("HNSW_ITERATIVE_SCAN", "strict_order")
+
+# Cross-request embedding micro-batching
+EMBEDDING_BATCH_MAX_SIZE = int(os.getenv("EMBEDDING_BATCH_MAX_SIZE", "32"))
+EMBEDDING_BATCH_MAX_WAIT_MS = float(os.getenv("EMBEDDING_BATCH_MAX_WAIT_MS", "5"))
+
+# Model the notes.embedding column was built with. After an online model
+# migration (scripts.reembed_notes) the active model is read from the
+# embedding_migrations table; update these when rolling the workers.
+EMBEDDING_MODEL_NAME = os.getenv("EMBEDDING_MODEL_NAME", "all-MiniLM-L6-v2")
+EMBEDDING_DIM = int(os.getenv("EMBEDDING_DIM", "384"))
+# How long a process trusts its cached view of the active model
+ACTIVE_MODEL_TTL_SECONDS = int(os.getenv("ACTIVE_MODEL_TTL_SECONDS", "5"))
+# "torch" (sentence-transformers) or "onnx" (int8 ONNX Runtime export
+# made by scripts.export_onnx_model, looked up under ONNX_MODEL_DIR)
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "torch")
+ONNX_MODEL_DIR = os.getenv("ONNX_MODEL_DIR", "models/onnx")
+# 0 lets ONNX Runtime pick (one thread per physical core)
+ONNX_INTRA_OP_THREADS = int(os.getenv("ONNX_INTRA_OP_THREADS", "0"))
+# Unix socket of a shared embedding server (scripts.embedding_server).
+# When set, API / ingestion processes send encode requests there instead
+# of loading a model themselves.
+EMBEDDING_SERVICE_SOCKET = os.getenv("EMBEDDING_SERVICE_SOCKET", "")
+EMBEDDING_SERVICE_TIMEOUT_SECONDS = float(os.getenv("EMBEDDING_SERVICE_TIMEOUT_SECONDS", "30"))
+REEMBED_BATCH_SIZE = int(os.getenv("REEMBED_BATCH_SIZE", "256"))
+
+# Query embedding cache
+QUERY_EMBEDDING_CACHE_SIZE = int(os.getenv("QUERY_EMBEDDING_CACHE_SIZE", "5000"))
+QUERY_EMBEDDING_CACHE_TTL_SECONDS = int(os.getenv("QUERY_EMBEDDING_CACHE_TTL_SECONDS", "86400"))
+
+UPLOAD_DIR = os.getenv("UPLOAD_DIR", "uploads")
+# Uploads are cut off (413) once they pass this size
+UPLOAD_MAX_BYTES = int(os.getenv("UPLOAD_MAX_BYTES", str(50 * 1024 * 1024)))
+
+# Note ingestion (text extraction + embedding) outside the upload request
+NOTE_TEXT_MAX_CHARS = int(os.getenv("NOTE_TEXT_MAX_CHARS", "5000"))
+INGESTION_IN_PROCESS = os.getenv("INGESTION_IN_PROCESS", "true").lower() == "true"
+INGESTION_WORKER_THREADS = int(os.getenv("INGESTION_WORKER_THREADS", "1"))
+INGESTION_EXTRACT_PROCESSES = int(os.getenv("INGESTION_EXTRACT_PROCESSES", "2"))
+INGESTION_BATCH_SIZE = int(os.getenv("INGESTION_BATCH_SIZE", "16"))
+INGESTION_POLL_INTERVAL_SECONDS = float(os.getenv("INGESTION_POLL_INTERVAL_SECONDS", "1"))
+INGESTION_LEASE_SECONDS = int(os.getenv("INGESTION_LEASE_SECONDS", "600"))
+INGESTION_MAX_ATTEMPTS = int(os.getenv("INGESTION_MAX_ATTEMPTS", "3"))
+
+# Passage-level (chunk) embeddings
+CHUNK_TEXT_MAX_CHARS = int(os.getenv("CHUNK_TEXT_MAX_CHARS", "200000"))
+# ~180 words stays under MiniLM's 256 word-piece input limit
+CHUNK_WINDOW_WORDS = int(os.getenv("CHUNK_WINDOW_WORDS", "180"))
+CHUNK_OVERLAP_WORDS = int(os.getenv("CHUNK_OVERLAP_WORDS", "40"))
+# Chunks fetched from the index per passage search (keep <= HNSW_EF_SEARCH)
+PASSAGE_CHUNK_LIMIT = int(os.getenv("PASSAGE_CHUNK_LIMIT", "100"))
+# "max": best chunk per note, "mean": mean of the note's top PASSAGE_TOP_K chunks
+PASSAGE_AGGREGATION = os.getenv("PASSAGE_AGGREGATION", "max")
+PASSAGE_TOP_K = int(os.getenv("PASSAGE_TOP_K", "3"))
+
+# Coalesced view / download / upvote counters
+COUNTER_FLUSH_INTERVAL_SECONDS = float(os.getenv("COUNTER_FLUSH_INTERVAL_SECONDS", "5"))
+COUNTER_FLUSH_BATCH_SIZE = int(os.getenv("COUNTER_FLUSH_BATCH_SIZE", "500"))
+
+# Resolved-user cache used by get_current_user
+AUTH_USER_CACHE_SIZE = int(os.getenv("AUTH_USER_CACHE_SIZE", "10000"))
+AUTH_USER_CACHE_TTL_SECONDS = int(os.getenv("AUTH_USER_CACHE_TTL_SECONDS", "60"))
+AUTH_NEGATIVE_CACHE_TTL_SECONDS = int(os.getenv("AUTH_NEGATIVE_CACHE_TTL_SECONDS", "10"))
+
+# Dedicated bcrypt pool for login / register
+HASHING_MAX_CONCURRENCY = int(os.getenv("HASHING_MAX_CONCURRENCY", "4"))
+HASHING_MAX_QUEUE = int(os.getenv("HASHING_MAX_QUEUE", "64"))
+
+# AI fallback note generation on search misses
+AI_NOTES_MAX_SOURCES = int(os.getenv("AI_NOTES_MAX_SOURCES", "5"))
+AI_NOTES_URL_TIMEOUT_SECONDS = float(os.getenv("AI_NOTES_URL_TIMEOUT_SECONDS", "5"))
+AI_NOTES_FETCH_DEADLINE_SECONDS = float(os.getenv("AI_NOTES_FETCH_DEADLINE_SECONDS", "8"))
+AI_NOTES_DEADLINE_SECONDS = float(os.getenv("AI_NOTES_DEADLINE_SECONDS", "45"))
+# Generated notes are reused per topic_key for this long before regenerating
+AI_NOTES_FRESHNESS_SECONDS = int(os.getenv("AI_NOTES_FRESHNESS_SECONDS", str(7 * 24 * 3600)))
+# A generation not finished within this long is assumed dead and may be retaken
+AI_NOTES_GENERATION_LEASE_SECONDS = int(os.getenv("AI_NOTES_GENERATION_LEASE_SECONDS", "120"))
+AI_NOTES_RETRY_SECONDS = int(os.getenv("AI_NOTES_RETRY_SECONDS", "300"))
+
+# Search result cache shared by the workers on a host (SQLite file).
+# Entries are dropped as soon as the corpus version in Postgres moves;
+# the TTL only bounds how long an unchanged corpus serves them.
+SEARCH_CACHE_ENABLED = os.getenv("SEARCH_CACHE_ENABLED", "true").lower() == "true"
+SEARCH_CACHE_PATH = os.getenv("SEARCH_CACHE_PATH", "search_cache.sqlite3")
+SEARCH_CACHE_MAX_BYTES = int(os.getenv("SEARCH_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+SEARCH_CACHE_TTL_SECONDS = int(os.getenv("SEARCH_CACHE_TTL_SECONDS", "300"))
+
+# Note retrieval strategy: "exact" (HNSW over full vectors) or "binary"
+# (Hamming search over binary-quantized vectors, then exact re-rank)
+NOTE_RETRIEVAL = os.getenv("NOTE_RETRIEVAL", "exact")
+# Binary path: Hamming candidates per result kept. More candidates cost
+# a wider HNSW scan (ef_search) and re-rank; recall@100 from
+# benchmarks/bench_binary_quantization.py (50k notes):
+#   default corpus:  x4 0.97, x10 0.98, x16 0.99
+#   --noise 2.0:     x4 0.57, x10 0.73, x16 0.80, x32 0.90
+# 10 is the most one HNSW scan returns for 100 candidates (ef_search is
+# capped at 1000); anything above is clamped to that.
+BINARY_OVERSAMPLE = int(os.getenv("BINARY_OVERSAMPLE", "10"))
+
+# Optional in-process NumPy mirror of public note embeddings
+NOTE_INDEX_ENABLED = os.getenv("NOTE_INDEX_ENABLED", "false").lower() == "true"
+NOTE_INDEX_DTYPE = os.getenv("NOTE_INDEX_DTYPE", "float32")
+NOTE_INDEX_MAX_BYTES = int(os.getenv("NOTE_INDEX_MAX_BYTES", str(256 * 1024 * 1024)))
+# Picks up notes changed by other processes (e.g. ingestion workers)
+NOTE_INDEX_REFRESH_SECONDS = float(os.getenv("NOTE_INDEX_REFRESH_SECONDS", "10"))
+
+# Challenge board listing
+CHALLENGE_PAGE_SIZE = int(os.getenv("CHALLENGE_PAGE_SIZE", "20"))
+CHALLENGE_MAX_PAGE_SIZE = int(os.getenv("CHALLENGE_MAX_PAGE_SIZE", "100"))
+CHALLENGE_FIRST_PAGE_TTL_SECONDS = int(os.getenv("CHALLENGE_FIRST_PAGE_TTL_SECONDS", "5"))
+
+# Bulk note import (multi-file endpoint and scripts.bulk_import)
+BULK_IMPORT_MAX_FILES = int(os.getenv("BULK_IMPORT_MAX_FILES", "200"))
+BULK_IMPORT_BATCH_SIZE = int(os.getenv("BULK_IMPORT_BATCH_SIZE", "64"))
@@ -1,5 +1,12 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 from passlib.context import CryptContext
 
+from app.core.config import HASHING_MAX_CONCURRENCY, HASHING_MAX_QUEUE
+
 pwd_context = CryptContext(
     schemes=["bcrypt"],
     deprecated="auto",
@@ -14,3 +21,99 @@ def hash_password(password: str) -> str:
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
+
+
+class HashingPoolSaturated(Exception):
+    pass
+
+
+class HashingPool:
+    """Bounded executor for bcrypt work, kept apart from the threadpool
+    that serves sync endpoints so a login burst cannot starve them."""
+
+    def __init__(self, max_workers: int, max_queue: int):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="bcrypt"
+        )
+        self._lock = threading.Lock()
+
+        self.in_flight = 0
+        self.running = 0
+        self.completed = 0
+        self.rejected = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+
+    async def run(self, fn, *args):
+        with self._lock:
+            if self.in_flight >= self.max_workers + self.max_queue:
+                self.rejected += 1
+                raise HashingPoolSaturated()
+
+            self.in_flight += 1
+
+        try:
+            future = self._executor.submit(self._timed, fn, args)
+        except BaseException:
+            self._release(None)
+            raise
+
+        # Released when the job finishes (or is cancelled before it
+        # starts), not when the caller stops waiting: a disconnected
+        # client's bcrypt run still occupies the pool
+        future.add_done_callback(self._release)
+
+        return await asyncio.wrap_future(future)
+
+    def _release(self, future):
+        with self._lock:
+            self.in_flight -= 1
+
+    def _timed(self, fn, args):
+        with self._lock:
+            self.running += 1
+
+        start = time.perf_counter()
+
+        try:
+            return fn(*args)
+
+        finally:
+            elapsed = time.perf_counter() - start
+
+            with self._lock:
+                self.running -= 1
+                self.completed += 1
+                self.total_seconds += elapsed
+                self.max_seconds = max(self.max_seconds, elapsed)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "running": self.running,
+                "queue_depth": self.in_flight - self.running,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "avg_ms": (
+                    self.total_seconds / self.completed * 1000
+                    if self.completed else 0.0
+                ),
+                "max_ms": self.max_seconds * 1000
+            }
+
+
+hashing_pool = HashingPool(HASHING_MAX_CONCURRENCY, HASHING_MAX_QUEUE)
+
+
+async def hash_password_async(password: str) -> str:
+    return await hashing_pool.run(hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await hashing_pool.run(verify_password, plain_password, hashed_password)
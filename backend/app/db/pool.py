@@ -0,0 +1,203 @@
+import threading
+import time
+import uuid
+from typing import NamedTuple
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from app.core.config import (
+    DB_POOL_PROFILE,
+    DB_POOL_SIZE,
+    DB_MAX_OVERFLOW,
+    DB_POOL_TIMEOUT_SECONDS,
+    DB_ECHO,
+    DB_PGBOUNCER
+)
+
+
+# DB_ECHO value -> create_engine(echo=...)
+ECHO_LEVELS = {"off": False, "statements": True, "debug": "debug"}
+
+# Upper bounds (seconds) of the checkout wait histogram buckets
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+
+class PoolProfile(NamedTuple):
+    pool_size: int
+    max_overflow: int
+    pool_timeout: float
+    echo: str = "off"
+    pgbouncer: bool = False
+
+
+POOL_PROFILES = {
+    # API workers: a request fails fast instead of queueing for 30 s
+    # behind an exhausted pool
+    "web": PoolProfile(pool_size=10, max_overflow=10, pool_timeout=10),
+    # Ingestion / re-embedding workers and scripts
+    "worker": PoolProfile(pool_size=2, max_overflow=2, pool_timeout=60),
+    # PgBouncer caps the server connections; client-side ones are cheap
+    "pgbouncer": PoolProfile(pool_size=20, max_overflow=20, pool_timeout=10, pgbouncer=True),
+    "debug": PoolProfile(pool_size=2, max_overflow=5, pool_timeout=30, echo="debug")
+}
+
+
+def pool_profile(name: str = DB_POOL_PROFILE) -> PoolProfile:
+    if name not in POOL_PROFILES:
+        raise ValueError(
+            f"Unknown DB_POOL_PROFILE {name!r}, expected one of: {', '.join(POOL_PROFILES)}"
+        )
+
+    overrides = {}
+
+    if DB_POOL_SIZE:
+        overrides["pool_size"] = int(DB_POOL_SIZE)
+
+    if DB_MAX_OVERFLOW:
+        overrides["max_overflow"] = int(DB_MAX_OVERFLOW)
+
+    if DB_POOL_TIMEOUT_SECONDS:
+        overrides["pool_timeout"] = float(DB_POOL_TIMEOUT_SECONDS)
+
+    if DB_ECHO:
+        if DB_ECHO not in ECHO_LEVELS:
+            raise ValueError(f"DB_ECHO must be one of: {', '.join(ECHO_LEVELS)}")
+
+        overrides["echo"] = DB_ECHO
+
+    if DB_PGBOUNCER:
+        overrides["pgbouncer"] = DB_PGBOUNCER.lower() == "true"
+
+    return POOL_PROFILES[name]._replace(**overrides)
+
+
+class PoolMetrics:
+    """Checkout waits, timeouts and overflow connections of one engine's
+    pool, recorded by its instrumented pool class. Live usage is read
+    from the pool itself when stats are taken."""
+
+    def __init__(self, profile: PoolProfile):
+        self.profile = profile
+
+        self._lock = threading.Lock()
+
+        self.checkouts = 0
+        self.timeouts = 0
+        self.overflow_connections = 0
+        self.peak_in_use = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.wait_buckets = [0] * (len(WAIT_BUCKETS) + 1)
+
+    def _record_wait(self, seconds: float):
+        self.wait_seconds += seconds
+        self.max_wait_seconds = max(self.max_wait_seconds, seconds)
+
+        for i, bound in enumerate(WAIT_BUCKETS):
+            if seconds <= bound:
+                self.wait_buckets[i] += 1
+                break
+        else:
+            self.wait_buckets[-1] += 1
+
+    def record_checkout(self, seconds: float, in_use: int):
+        with self._lock:
+            self.checkouts += 1
+            self.peak_in_use = max(self.peak_in_use, in_use)
+            self._record_wait(seconds)
+
+    def record_timeout(self, seconds: float):
+        with self._lock:
+            self.timeouts += 1
+            self._record_wait(seconds)
+
+    def record_overflow(self):
+        with self._lock:
+            self.overflow_connections += 1
+
+    def stats(self, pool):
+        with self._lock:
+            waits = self.checkouts + self.timeouts
+
+            return {
+                "pool_size": self.profile.pool_size,
+                "max_overflow": self.profile.max_overflow,
+                "timeout_s": self.profile.pool_timeout,
+                "in_use": pool.checkedout(),
+                "idle": pool.checkedin(),
+                "overflow_in_use": max(pool.overflow(), 0),
+                "peak_in_use": self.peak_in_use,
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "overflow_connections": self.overflow_connections,
+                "avg_wait_ms": self.wait_seconds / waits * 1000 if waits else 0.0,
+                "max_wait_ms": self.max_wait_seconds * 1000,
+                # Cumulative, as in a Prometheus histogram
+                "wait_ms_buckets": {
+                    **{
+                        f"le_{bound * 1000:g}": sum(self.wait_buckets[:i + 1])
+                        for i, bound in enumerate(WAIT_BUCKETS)
+                    },
+                    "le_inf": waits
+                }
+            }
+
+
+class _InstrumentedPool:
+    # Set on the subclass made by instrumented_pool_class; pool.recreate()
+    # (engine.dispose) builds the new pool from the same class
+    metrics: PoolMetrics = None
+
+    def _do_get(self):
+        start = time.perf_counter()
+
+        try:
+            record = super()._do_get()
+        except PoolTimeoutError:
+            self.metrics.record_timeout(time.perf_counter() - start)
+            raise
+
+        self.metrics.record_checkout(time.perf_counter() - start, self.checkedout())
+
+        return record
+
+    def _create_connection(self):
+        record = super()._create_connection()
+
+        # Past pool_size: closed again on checkin instead of kept
+        if self.overflow() > 0:
+            self.metrics.record_overflow()
+
+        return record
+
+
+def instrumented_pool_class(base, metrics: PoolMetrics):
+    return type(f"Instrumented{base.__name__}", (_InstrumentedPool, base), {"metrics": metrics})
+
+
+def engine_options(profile: PoolProfile, metrics: PoolMetrics, asyncio: bool = False):
+    options = {
+        "echo": ECHO_LEVELS[profile.echo],
+        "poolclass": instrumented_pool_class(
+            AsyncAdaptedQueuePool if asyncio else QueuePool,
+            metrics
+        ),
+        "pool_size": profile.pool_size,
+        "max_overflow": profile.max_overflow,
+        "pool_timeout": profile.pool_timeout,
+        "pool_pre_ping": True,
+        "pool_recycle": 1800
+    }
+
+    # psycopg2 never prepares statements server-side; asyncpg does, and
+    # under transaction pooling the next statement may reach a server
+    # connection where that prepared statement doesn't exist
+    if profile.pgbouncer and asyncio:
+        options["connect_args"] = {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid.uuid4()}__"
+        }
+
+    return options
@@ -1,30 +1,112 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from pgvector.asyncpg import register_vector
 from dotenv import load_dotenv
 import os
 
+from app.db.pool import PoolMetrics, engine_options, pool_profile
+from app.db.vector_index import apply_local_search_params, apply_search_params
+
 load_dotenv(override=True)
 
 DATABASE_URL = os.getenv("DATABASE_URL")
 
-print(">>> FINAL DATABASE_URL =", DATABASE_URL)
+profile = pool_profile()
 
-engine = create_engine(
-    DATABASE_URL,
-    echo=True,
-    pool_pre_ping=True,
-    pool_recycle=1800
+# HNSW settings per connection, or per transaction behind PgBouncer
+search_params_event, search_params_listener = (
+    ("begin", apply_local_search_params) if profile.pgbouncer
+    else ("connect", apply_search_params)
 )
 
+pool_metrics = PoolMetrics(profile)
+
+engine = create_engine(DATABASE_URL, **engine_options(profile, pool_metrics))
+
+event.listen(engine, search_params_event, search_params_listener)
+
 SessionLocal = sessionmaker(
     autocommit=False,
     autoflush=False,
     bind=engine
 )
 
+# Request path: same database through asyncpg. Scripts, workers and the
+# write endpoints keep using the sync engine above.
+async_pool_metrics = PoolMetrics(profile)
+
+async_engine = create_async_engine(
+    make_url(DATABASE_URL).set(drivername="postgresql+asyncpg"),
+    **engine_options(profile, async_pool_metrics, asyncio=True)
+)
+
+
+@event.listens_for(async_engine.sync_engine, "connect")
+def _register_vector(dbapi_connection, connection_record):
+    # Binary codec for vector parameters and results
+    dbapi_connection.run_async(register_vector)
+
+
+event.listen(async_engine.sync_engine, search_params_event, search_params_listener)
+
+AsyncSessionLocal = async_sessionmaker(
+    async_engine,
+    autoflush=False,
+    expire_on_commit=False
+)
+
+
+def pool_stats():
+    return {
+        "profile": profile._asdict(),
+        "sync": pool_metrics.stats(engine.pool),
+        "async": async_pool_metrics.stats(async_engine.sync_engine.pool)
+    }
+
+
+def prime_pool(connections: int = None):
+    # Open the pool's connections up front so the first requests after a
+    # (re)start don't each pay for a connect
+    connections = engine.pool.size() if connections is None else connections
+    opened = []
+
+    try:
+        for _ in range(connections):
+            conn = engine.connect()
+            conn.execute(text("SELECT 1"))
+            opened.append(conn)
+    finally:
+        for conn in opened:
+            conn.close()
+
+
+async def prime_async_pool(connections: int = None):
+    # Same for the async engine. asyncpg connections belong to the event
+    # loop that opened them, so this has to run on the app's loop.
+    pool = async_engine.sync_engine.pool
+    connections = pool.size() if connections is None else connections
+    opened = []
+
+    try:
+        for _ in range(connections):
+            conn = await async_engine.connect()
+            await conn.execute(text("SELECT 1"))
+            opened.append(conn)
+    finally:
+        for conn in opened:
+            await conn.close()
+
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
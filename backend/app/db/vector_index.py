@@ -0,0 +1,129 @@
+import logging
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from app.core.config import (
+    HNSW_M,
+    HNSW_EF_CONSTRUCTION,
+    HNSW_EF_SEARCH,
+    HNSW_ITERATIVE_SCAN
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+NOTES_EMBEDDING_INDEX = "ix_notes_embedding_hnsw"
+NOTE_CHUNKS_EMBEDDING_INDEX = "ix_note_chunks_embedding_hnsw"
+
+# index name -> (table, column), for the rebuild command
+VECTOR_INDEXES = {
+    NOTES_EMBEDDING_INDEX: ("notes", "embedding"),
+    NOTE_CHUNKS_EMBEDDING_INDEX: ("note_chunks", "embedding")
+}
+
+
+def create_index_sql(
+    index_name: str,
+    table: str,
+    column: str,
+    m: int = HNSW_M,
+    ef_construction: int = HNSW_EF_CONSTRUCTION,
+    concurrently: bool = True
+) -> str:
+    return (
+        f"CREATE INDEX {'CONCURRENTLY ' if concurrently else ''}"
+        f"IF NOT EXISTS {index_name} "
+        f"ON {table} USING hnsw ({column} vector_cosine_ops) "
+        f"WITH (m = {int(m)}, ef_construction = {int(ef_construction)})"
+    )
+
+
+def apply_search_params(dbapi_connection, connection_record):
+    # Registered as a pool "connect" listener, so every pooled connection
+    # searches with the configured recall / latency trade-off.
+    cursor = dbapi_connection.cursor()
+    cursor.execute(f"SET hnsw.ef_search = {int(HNSW_EF_SEARCH)}")
+    dbapi_connection.commit()
+
+    if HNSW_ITERATIVE_SCAN in ("strict_order", "relaxed_order"):
+        try:
+            cursor.execute(f"SET hnsw.iterative_scan = {HNSW_ITERATIVE_SCAN}")
+            dbapi_connection.commit()
+        except Exception:
+            # pgvector < 0.8: filtered searches fall back to a single scan
+            dbapi_connection.rollback()
+            logger.warning("hnsw.iterative_scan is not supported by this pgvector")
+
+    cursor.close()
+
+
+def apply_local_search_params(conn):
+    # Registered as an engine "begin" listener behind PgBouncer in
+    # transaction mode instead: a session-level SET would stay on
+    # whichever server connection the transaction happened to get.
+    settings = [f"set_config('hnsw.ef_search', '{int(HNSW_EF_SEARCH)}', true)"]
+
+    if HNSW_ITERATIVE_SCAN in ("strict_order", "relaxed_order"):
+        settings.append(f"set_config('hnsw.iterative_scan', '{HNSW_ITERATIVE_SCAN}', true)")
+
+    conn.exec_driver_sql(f"SELECT {', '.join(settings)}")
+
+
+def get_index_params(conn, index_name: str):
+    row = conn.execute(
+        text("SELECT reloptions FROM pg_class WHERE relname = :name"),
+        {"name": index_name}
+    ).fetchone()
+
+    if row is None:
+        return None
+
+    params = {}
+
+    for option in row.reloptions or []:
+        key, _, value = option.partition("=")
+        params[key] = int(value)
+
+    return params
+
+
+def rebuild_index(
+    engine: Engine,
+    index_name: str = NOTES_EMBEDDING_INDEX,
+    table: str = "notes",
+    column: str = "embedding",
+    m: int = HNSW_M,
+    ef_construction: int = HNSW_EF_CONSTRUCTION
+):
+    # CONCURRENTLY statements cannot run inside a transaction block
+    with engine.connect().execution_options(
+        isolation_level="AUTOCOMMIT"
+    ) as conn:
+
+        current = get_index_params(conn, index_name)
+
+        if current is None:
+            conn.execute(text(create_index_sql(
+                index_name, table, column, m, ef_construction
+            )))
+            return "created"
+
+        if current.get("m") == m and current.get("ef_construction") == ef_construction:
+            # Same parameters: rebuild the graph over the grown corpus
+            conn.execute(text(f"REINDEX INDEX CONCURRENTLY {index_name}"))
+            return "reindexed"
+
+        # New parameters: build a replacement next to the live index and
+        # swap it in, so searches keep using an index throughout.
+        new_name = f"{index_name}_new"
+
+        conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {new_name}"))
+        conn.execute(text(create_index_sql(
+            new_name, table, column, m, ef_construction
+        )))
+        conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {index_name}"))
+        conn.execute(text(f"ALTER INDEX {new_name} RENAME TO {index_name}"))
+
+        return "replaced"
@@ -1,26 +1,108 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
+from sqlalchemy import event, inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.core.config import JWT_SECRET, JWT_ALGORITHM
-from app.db.session import get_db
+from app.core.config import (
+    JWT_SECRET,
+    JWT_ALGORITHM,
+    AUTH_USER_CACHE_SIZE,
+    AUTH_USER_CACHE_TTL_SECONDS,
+    AUTH_NEGATIVE_CACHE_TTL_SECONDS
+)
+from app.db.session import get_async_db, get_db
 from app.models.user import User
+from app.utils.ttl_cache import TTLCache
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
+# Token subject (email) -> detached User, so authenticated requests
+# normally resolve the principal without a query. Per process: other
+# workers see changes once their entry's TTL runs out.
+user_cache = TTLCache(
+    maxsize=AUTH_USER_CACHE_SIZE,
+    ttl=AUTH_USER_CACHE_TTL_SECONDS
+)
 
-def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
-):
+# Cached marker for subjects with no matching user
+_UNKNOWN_USER = object()
+
+
+def invalidate_user(email: str):
+    user_cache.invalidate(email)
+
+
+def clear_user_cache():
+    user_cache.clear()
+
+
+@event.listens_for(User, "after_insert")
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_changed_user(mapper, connection, target):
+    invalidate_user(target.email)
+
+    # Also drop the entry under the previous email if it changed
+    for email in inspect(target).attrs.email.history.deleted:
+        invalidate_user(email)
+
+
+def _cached_user(email: str):
+    # (hit, user): a cached miss is a hit with no user
+    cached = user_cache.get(email)
+
+    if cached is _UNKNOWN_USER:
+        return True, None
+
+    return cached is not None, cached
+
+
+def _remember_user(db, email: str, user):
+    if not user:
+        user_cache.set(email, _UNKNOWN_USER, ttl=AUTH_NEGATIVE_CACHE_TTL_SECONDS)
+        return None
+
+    # Detach so the instance can outlive this request's session
+    db.expunge(user)
+    user_cache.set(email, user)
+
+    return user
+
+
+def _resolve_user(db: Session, email: str):
+    hit, user = _cached_user(email)
+
+    if hit:
+        return user
 
-    credentials_exception = HTTPException(
+    return _remember_user(db, email, db.query(User).filter(User.email == email).first())
+
+
+async def _resolve_user_async(db: AsyncSession, email: str):
+    hit, user = _cached_user(email)
+
+    if hit:
+        return user
+
+    result = await db.execute(select(User).where(User.email == email))
+
+    return _remember_user(db, email, result.scalars().first())
+
+
+def _credentials_exception():
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Invalid or expired token",
         headers={"WWW-Authenticate": "Bearer"},
     )
 
+
+def _token_email(token: str) -> str:
+
+    credentials_exception = _credentials_exception()
+
     try:
         payload = jwt.decode(
             token,
@@ -36,10 +118,13 @@ def get_current_user(
     except JWTError:
         raise credentials_exception
 
-    user = db.query(User).filter(User.email == email).first()
+    return email
+
+
+def _active_user(user):
 
     if not user:
-        raise credentials_exception
+        raise _credentials_exception()
 
     if not user.is_active:
         raise HTTPException(
@@ -48,3 +133,20 @@ def get_current_user(
         )
 
     return user
+
+
+# For def routes: resolves on the sync pool the route already uses, so
+# a request holds connections from one pool only
+def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    db: Session = Depends(get_db)
+):
+    return _active_user(_resolve_user(db, _token_email(token)))
+
+
+# For async def routes on get_async_db
+async def get_current_user_async(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_async_db)
+):
+    return _active_user(await _resolve_user_async(db, _token_email(token)))
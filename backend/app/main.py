@@ -1,13 +1,20 @@
 from fastapi import FastAPI
 from sqlalchemy import text
 
-from app.db.session import engine
+from app.core.config import INGESTION_IN_PROCESS
+from app.db.session import async_engine, engine
 from app.db.base import Base
+from app.ml.note_index import note_index
+from app.services.ingestion import start_ingestion_worker, stop_ingestion_worker
+from app.services.note_counters import note_counters
+from app.services.readiness import readiness
 
 from app.api.auth import router as auth_router
 from app.api.note import router as note_router
 from app.api.search import router as search_router
 from app.api.challenge import router as challenge_router
+from app.api.metrics import router as metrics_router
+from app.api.health import router as health_router
 
 
 
@@ -19,6 +26,8 @@ app.include_router(auth_router)
 app.include_router(note_router)
 app.include_router(search_router)
 app.include_router(challenge_router)
+app.include_router(metrics_router)
+app.include_router(health_router)
 
 
 @app.on_event("startup")
@@ -31,6 +40,45 @@ def startup_event():
     # Create tables (development only)
     Base.metadata.create_all(bind=engine)
 
+    # Process queued uploads in this process unless dedicated
+    # workers (scripts/ingestion_worker.py) are deployed
+    if INGESTION_IN_PROCESS:
+        start_ingestion_worker()
+
+    note_counters.start()
+
+    # Loads in the background; search uses SQL until it is ready
+    if note_index is not None:
+        note_index.start()
+
+    # Pool priming and model warm-up run in the background; /health/ready
+    # reports 503 until both are done
+    readiness.start()
+
+
+@app.on_event("startup")
+async def prime_async_engine():
+    # The async pool is primed on this event loop rather than in the
+    # readiness thread; /health/ready waits for it as well
+    readiness.start_async()
+
+
+@app.on_event("shutdown")
+def shutdown_event():
+    stop_ingestion_worker()
+
+    if note_index is not None:
+        note_index.stop()
+
+    # Write out buffered view / download / upvote increments
+    note_counters.stop()
+
+
+@app.on_event("shutdown")
+async def close_async_engine():
+    # asyncpg connections belong to this event loop
+    await async_engine.dispose()
+
 
 @app.get("/health")
 def health_check():
@@ -0,0 +1,120 @@
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, List
+
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingBatcher:
+    """Collects encode requests from concurrent callers and runs them
+    through the model as one batch."""
+
+    def __init__(
+        self,
+        encode: Callable[[List[str]], List[List[float]]],
+        max_batch_size: int = 32,
+        max_wait_ms: float = 5
+    ):
+        self._encode = encode
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000
+
+        self._queue = queue.Queue()
+        self._thread = None
+        self._start_lock = threading.Lock()
+
+    def submit(self, texts: List[str]) -> Future:
+        future = Future()
+
+        if not texts:
+            future.set_result([])
+            return future
+
+        self._ensure_started()
+        self._queue.put((list(texts), future))
+
+        return future
+
+    def encode(self, text: str) -> List[float]:
+        return self.submit([text]).result()[0]
+
+    def encode_many(self, texts: List[str]) -> List[List[float]]:
+        return self.submit(texts).result()
+
+    def _ensure_started(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        with self._start_lock:
+            # Also replaces a worker that died, so queued requests don't
+            # wait forever
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run,
+                    name="embedding-batcher",
+                    daemon=True
+                )
+                self._thread.start()
+
+    def _collect(self):
+        # Block for the first request, then wait at most max_wait for
+        # others to join the batch. Requests cancelled by their caller
+        # while queued are dropped.
+        batch = []
+        size = 0
+        deadline = None
+
+        while size < self.max_batch_size:
+            if deadline is None:
+                item = self._queue.get()
+            else:
+                remaining = deadline - time.monotonic()
+
+                try:
+                    if remaining > 0:
+                        item = self._queue.get(timeout=remaining)
+                    else:
+                        item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+
+            if not item[1].set_running_or_notify_cancel():
+                continue
+
+            if deadline is None:
+                deadline = time.monotonic() + self.max_wait
+
+            batch.append(item)
+            size += len(item[0])
+
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+
+            texts = [text for item_texts, _ in batch for text in item_texts]
+
+            try:
+                vectors = self._encode(texts)
+            except Exception as exc:
+                vectors = None
+                error = exc
+
+            offset = 0
+
+            for item_texts, future in batch:
+                # One bad hand-out must not stop the worker
+                try:
+                    if vectors is None:
+                        future.set_exception(error)
+                    else:
+                        future.set_result(vectors[offset:offset + len(item_texts)])
+                except Exception:
+                    logger.exception("Returning an embedding batch result failed")
+
+                offset += len(item_texts)
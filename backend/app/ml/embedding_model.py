@@ -1,8 +1,195 @@
-from sentence_transformers import SentenceTransformer
+import asyncio
+import logging
+import threading
 
-# Load model once when module loads
-model = SentenceTransformer("all-MiniLM-L6-v2")
+from app.core.config import (
+    EMBEDDING_MODEL_NAME,
+    EMBEDDING_BACKEND,
+    EMBEDDING_BATCH_MAX_SIZE,
+    EMBEDDING_BATCH_MAX_WAIT_MS,
+    EMBEDDING_SERVICE_SOCKET,
+    QUERY_EMBEDDING_CACHE_SIZE,
+    QUERY_EMBEDDING_CACHE_TTL_SECONDS
+)
+from app.ml.embedding_batcher import EmbeddingBatcher
+from app.ml.embedding_service import EmbeddingServiceClient
+from app.utils.ttl_cache import TTLCache
 
-def generate_embedding(text: str):
-    embedding = model.encode(text)
-    return embedding.tolist()
\ No newline at end of file
+
+logger = logging.getLogger(__name__)
+
+
+def load_encoder(name: str, backend: str = EMBEDDING_BACKEND):
+    if backend == "onnx":
+        from app.ml.onnx_encoder import OnnxEncoder, model_dir
+
+        return OnnxEncoder(model_dir(name))
+
+    # torch import and weight loading take seconds
+    from sentence_transformers import SentenceTransformer
+
+    return SentenceTransformer(name)
+
+
+class ModelProvider:
+    """Loads the encoder for a model on first use (or ahead of time via
+    load / start_warm_up) instead of at import, so processes that never
+    encode, or that only need to answer health checks yet, start fast."""
+
+    def __init__(self, name: str, backend: str = EMBEDDING_BACKEND):
+        self.name = name
+        self.backend = backend
+
+        self._model = None
+        self._lock = threading.Lock()
+        self._warm_up_thread = None
+
+        self.warm = False
+        self.error = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._model is not None
+
+    def get(self):
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    self._model = load_encoder(self.name, self.backend)
+
+        return self._model
+
+    def load(self):
+        # Weights only. Safe in a preloading master: no encode has run, so
+        # no torch thread pool exists yet to be broken by fork. An ONNX
+        # Runtime session starts its threads on creation, so that backend
+        # (a small int8 model) is left to each worker. With an embedding
+        # server there is nothing to load here.
+        if self.backend == "onnx" or embedding_service is not None:
+            return
+
+        self.get()
+
+    def warm_up(self):
+        try:
+            # Through the batcher, so its thread is started as well (or
+            # a round trip to the embedding server, when one is used)
+            generate_embedding("warm up", self.name)
+            self.warm = True
+        except Exception as e:
+            self.error = str(e)
+            logger.exception("Embedding model warm-up failed")
+
+    def start_warm_up(self):
+        if self._warm_up_thread is None:
+            self._warm_up_thread = threading.Thread(
+                target=self.warm_up,
+                name=f"embedding-warm-up-{self.name}",
+                daemon=True
+            )
+            self._warm_up_thread.start()
+
+
+model_name = EMBEDDING_MODEL_NAME
+
+# Other models are loaded on first use (online model migrations)
+_providers = {}
+_batchers = {}
+_lock = threading.RLock()
+
+
+def get_provider(name: str = None) -> ModelProvider:
+    name = name or model_name
+
+    with _lock:
+        provider = _providers.get(name)
+
+        if provider is None:
+            provider = _providers[name] = ModelProvider(name)
+
+        return provider
+
+
+def get_model(name: str = None):
+    return get_provider(name).get()
+
+
+def _batcher(name: str = None) -> EmbeddingBatcher:
+    name = name or model_name
+
+    with _lock:
+        batcher = _batchers.get(name)
+
+        if batcher is None:
+            provider = get_provider(name)
+
+            def encode_batch(texts):
+                embeddings = provider.get().encode(texts, batch_size=EMBEDDING_BATCH_MAX_SIZE)
+                return embeddings.tolist()
+
+            # Concurrent requests share one forward pass instead of one each
+            batcher = _batchers[name] = EmbeddingBatcher(
+                encode_batch,
+                max_batch_size=EMBEDDING_BATCH_MAX_SIZE,
+                max_wait_ms=EMBEDDING_BATCH_MAX_WAIT_MS
+            )
+
+    return batcher
+
+
+provider = get_provider(model_name)
+
+# One shared model process instead of a copy per worker
+embedding_service = (
+    EmbeddingServiceClient(EMBEDDING_SERVICE_SOCKET) if EMBEDDING_SERVICE_SOCKET else None
+)
+
+# Keyed by (model, query): vectors from another model are meaningless
+query_embedding_cache = TTLCache(
+    maxsize=QUERY_EMBEDDING_CACHE_SIZE,
+    ttl=QUERY_EMBEDDING_CACHE_TTL_SECONDS
+)
+
+
+def encode_in_process(texts, name: str = None):
+    return _batcher(name).encode_many(texts)
+
+
+def generate_embedding(text: str, name: str = None):
+    if embedding_service is not None:
+        return embedding_service.encode(text, name)
+
+    return _batcher(name).encode(text)
+
+
+def generate_embeddings(texts, name: str = None):
+    if embedding_service is not None:
+        return embedding_service.encode_many(texts, name)
+
+    return encode_in_process(texts, name)
+
+
+def canonicalize_query(query: str) -> str:
+    # The model is uncased, so case and spacing never change the vector
+    return " ".join(query.lower().split())
+
+
+async def generate_query_embedding(query: str, name: str = None):
+    name = name or model_name
+    key = (name, canonicalize_query(query))
+
+    embedding = query_embedding_cache.get(key)
+
+    if embedding is None:
+        if embedding_service is not None:
+            embedding = await asyncio.to_thread(embedding_service.encode, key[1], name)
+        else:
+            # Wait on the batcher's future without holding a thread.
+            # Shielded: a cancelled request (client gone) stops waiting
+            # but leaves the batcher's future alone.
+            future = asyncio.wrap_future(_batcher(name).submit([key[1]]))
+            embedding = (await asyncio.shield(future))[0]
+
+        query_embedding_cache.set(key, embedding)
+
+    return embedding
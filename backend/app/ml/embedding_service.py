@@ -0,0 +1,159 @@
+import json
+import os
+import socket
+import socketserver
+import struct
+import threading
+
+import numpy as np
+
+from app.core.config import EMBEDDING_SERVICE_TIMEOUT_SECONDS
+
+
+# Frames: 4-byte big-endian length, then the payload. A request is one
+# JSON frame {"model", "texts"}; a response is a JSON header frame
+# {"ok", "count", "dim"} followed, on success, by the float32 vectors.
+HEADER = struct.Struct(">I")
+
+
+class EmbeddingServiceError(Exception):
+    pass
+
+
+def _recv_exactly(sock, size: int) -> bytes:
+    buffer = bytearray()
+
+    while len(buffer) < size:
+        chunk = sock.recv(size - len(buffer))
+
+        if not chunk:
+            raise ConnectionError("embedding service closed the connection")
+
+        buffer.extend(chunk)
+
+    return bytes(buffer)
+
+
+def send_frame(sock, payload: bytes):
+    sock.sendall(HEADER.pack(len(payload)) + payload)
+
+
+def recv_frame(sock) -> bytes:
+    (size,) = HEADER.unpack(_recv_exactly(sock, HEADER.size))
+    return _recv_exactly(sock, size)
+
+
+class EmbeddingServiceClient:
+    """Sends encode requests to the embedding server over its Unix socket.
+    One persistent connection per thread; a broken one is replaced once."""
+
+    def __init__(self, path: str, timeout: float = EMBEDDING_SERVICE_TIMEOUT_SECONDS):
+        self.path = path
+        self.timeout = timeout
+
+        self._local = threading.local()
+
+    def _connect(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        sock.connect(self.path)
+        return sock
+
+    def _close(self):
+        sock = getattr(self._local, "sock", None)
+
+        if sock is not None:
+            sock.close()
+            self._local.sock = None
+
+    def _request(self, payload: bytes):
+        sock = getattr(self._local, "sock", None)
+
+        if sock is None:
+            sock = self._local.sock = self._connect()
+
+        send_frame(sock, payload)
+        header = json.loads(recv_frame(sock))
+
+        if not header["ok"]:
+            raise EmbeddingServiceError(header["error"])
+
+        vectors = np.frombuffer(recv_frame(sock), dtype="<f4")
+
+        return vectors.reshape(header["count"], header["dim"]).tolist()
+
+    def encode_many(self, texts, model: str = None):
+        if not texts:
+            return []
+
+        payload = json.dumps({"model": model, "texts": list(texts)}).encode()
+
+        for attempt in range(2):
+            try:
+                return self._request(payload)
+            except TimeoutError:
+                # The reply may still arrive; this connection is out of step
+                self._close()
+                raise
+            except OSError:
+                # Server restarted, or an idle connection went away
+                self._close()
+
+                if attempt:
+                    raise
+
+    def encode(self, text: str, model: str = None):
+        return self.encode_many([text], model)[0]
+
+
+class _Handler(socketserver.BaseRequestHandler):
+
+    def handle(self):
+        while True:
+            try:
+                request = json.loads(recv_frame(self.request))
+            except ConnectionError:
+                return
+
+            try:
+                # Every client thread feeds the same per-model batcher
+                vectors = np.asarray(
+                    self.server.encode(request["texts"], request.get("model")),
+                    dtype="<f4"
+                )
+            except Exception as e:
+                send_frame(self.request, json.dumps({"ok": False, "error": str(e)}).encode())
+                continue
+
+            send_frame(self.request, json.dumps({
+                "ok": True,
+                "count": vectors.shape[0],
+                "dim": vectors.shape[1]
+            }).encode())
+            send_frame(self.request, vectors.tobytes())
+
+
+class EmbeddingServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    # Every worker thread of every API process may connect at once
+    request_queue_size = 1024
+
+    def __init__(self, path: str, encode):
+        # A socket file left behind by a previous run blocks bind()
+        if os.path.exists(path):
+            probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+
+            try:
+                probe.connect(path)
+            except OSError:
+                os.remove(path)
+            else:
+                raise EmbeddingServiceError(f"an embedding server is already listening on {path}")
+            finally:
+                probe.close()
+
+        self.encode = encode
+        super().__init__(path, _Handler)
+
+        os.chmod(path, 0o660)
@@ -0,0 +1,331 @@
+import logging
+import threading
+
+import numpy as np
+from pgvector.sqlalchemy import Vector
+from sqlalchemy import event, inspect, text
+from sqlalchemy.orm import Session
+
+from app.core.config import (
+    EMBEDDING_DIM,
+    NOTE_INDEX_ENABLED,
+    NOTE_INDEX_DTYPE,
+    NOTE_INDEX_MAX_BYTES,
+    NOTE_INDEX_REFRESH_SECONDS
+)
+from app.db.session import SessionLocal
+from app.models.note import Note
+
+
+logger = logging.getLogger(__name__)
+
+DIM = EMBEDDING_DIM
+
+# Rows scored per step when the matrix is float16 (converted to float32)
+SCORE_BLOCK_ROWS = 65536
+
+
+class NoteIndexFull(Exception):
+    pass
+
+
+class NoteVectorIndex:
+    """Contiguous matrix of public note embeddings plus their ids, searched
+    with one matrix-vector product and argpartition."""
+
+    def __init__(self, dim: int = DIM, dtype: str = "float32", max_bytes: int = NOTE_INDEX_MAX_BYTES):
+        self.dim = dim
+        self.dtype = np.dtype(dtype)
+        self.max_rows = max_bytes // (dim * self.dtype.itemsize)
+
+        self._lock = threading.RLock()
+        self._matrix = np.empty((0, dim), dtype=self.dtype)
+        self._ids = []
+        self._positions = {}
+        self._size = 0
+
+        self.ready = False
+        self._watermark = None
+
+    def __len__(self):
+        return self._size
+
+    def _normalize(self, embedding):
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def _grow(self, needed: int):
+        if needed > self.max_rows:
+            raise NoteIndexFull(f"note index budget is {self.max_rows} rows")
+
+        capacity = min(self.max_rows, max(needed, 2 * len(self._matrix), 1024))
+        matrix = np.empty((capacity, self.dim), dtype=self.dtype)
+        matrix[:self._size] = self._matrix[:self._size]
+        self._matrix = matrix
+
+    def upsert(self, note_id, embedding):
+        note_id = str(note_id)
+        vector = self._normalize(embedding)
+
+        with self._lock:
+            row = self._positions.get(note_id)
+
+            if row is None:
+                if self._size >= len(self._matrix):
+                    self._grow(self._size + 1)
+
+                row = self._size
+                self._ids.append(note_id)
+                self._positions[note_id] = row
+                self._size += 1
+
+            self._matrix[row] = vector
+
+    def remove(self, note_id):
+        note_id = str(note_id)
+
+        with self._lock:
+            row = self._positions.pop(note_id, None)
+
+            if row is None:
+                return
+
+            # Move the last row into the hole to stay contiguous
+            last = self._size - 1
+
+            if row != last:
+                self._matrix[row] = self._matrix[last]
+                moved = self._ids[last]
+                self._ids[row] = moved
+                self._positions[moved] = row
+
+            self._ids.pop()
+            self._size -= 1
+
+    def _scores(self, query):
+        matrix = self._matrix[:self._size]
+
+        if self.dtype == np.float32:
+            return matrix @ query
+
+        scores = np.empty(self._size, dtype=np.float32)
+
+        for start in range(0, self._size, SCORE_BLOCK_ROWS):
+            block = matrix[start:start + SCORE_BLOCK_ROWS].astype(np.float32)
+            scores[start:start + SCORE_BLOCK_ROWS] = block @ query
+
+        return scores
+
+    def search(self, query_embedding, k: int):
+        query = self._normalize(query_embedding)
+
+        with self._lock:
+            if self._size == 0:
+                return []
+
+            scores = self._scores(query)
+
+            if self._size > k:
+                top = np.argpartition(-scores, k)[:k]
+            else:
+                top = np.arange(self._size)
+
+            top = top[np.argsort(-scores[top])]
+
+            return [(self._ids[i], float(scores[i])) for i in top]
+
+    def _apply_rows(self, rows):
+        for row in rows:
+            if row.searchable and row.embedding is not None:
+                self.upsert(row.id, row.embedding)
+            else:
+                self.remove(row.id)
+
+    def load(self, db: Session, batch_size: int = 5000):
+        watermark = db.execute(text("SELECT now()")).scalar()
+
+        # Typed as Vector: no pgvector adapter is registered on the sync
+        # engine, so psycopg2 returns the column as '[...]' text
+        result = db.execute(
+            text("""
+                SELECT id, embedding, true AS searchable
+                FROM notes
+                WHERE is_private = false
+                  AND status = 'ready'
+                  AND embedding IS NOT NULL
+            """).columns(embedding=Vector(self.dim)).execution_options(yield_per=batch_size)
+        )
+
+        for rows in result.partitions():
+            self._apply_rows(rows)
+
+        self._watermark = watermark
+        self.ready = True
+
+    def refresh(self, db: Session):
+        # Re-read a little before the last watermark: updated_at is set
+        # when a statement runs, which can be before its commit is visible
+        watermark = db.execute(text("SELECT now()")).scalar()
+
+        rows = db.execute(
+            text("""
+                SELECT
+                    id,
+                    embedding,
+                    (is_private = false AND status = 'ready') AS searchable
+                FROM notes
+                WHERE updated_at > CAST(:since AS timestamptz) - interval '1 minute'
+            """).columns(embedding=Vector(self.dim)),
+            {"since": self._watermark}
+        ).fetchall()
+
+        self._apply_rows(rows)
+        self._watermark = watermark
+
+    def stats(self):
+        with self._lock:
+            return {
+                "ready": self.ready,
+                "notes": self._size,
+                "max_notes": self.max_rows,
+                "bytes": self._size * self.dim * self.dtype.itemsize,
+                "dtype": self.dtype.name
+            }
+
+
+class NoteIndexService:
+    """Loads the mirror in the background, keeps it in sync and disables
+    it (search falls back to SQL) if it cannot fit the memory budget."""
+
+    def __init__(self, index: NoteVectorIndex, refresh_interval: float):
+        self.index = index
+        self.refresh_interval = refresh_interval
+
+        self._stop = threading.Event()
+        self._thread = None
+        self.disabled_reason = None
+
+    @property
+    def available(self) -> bool:
+        return self.index.ready and self.disabled_reason is None
+
+    def start(self):
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run,
+                name="note-index",
+                daemon=True
+            )
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _with_session(self, fn):
+        db = SessionLocal()
+
+        try:
+            fn(db)
+        finally:
+            db.close()
+
+    def _disable(self, exc):
+        logger.warning("Note index disabled, using SQL search: %s", exc)
+        self.disabled_reason = str(exc)
+        self.index.ready = False
+
+    def _run(self):
+        try:
+            self._with_session(self.index.load)
+        except NoteIndexFull as exc:
+            self._disable(exc)
+            return
+        except Exception:
+            logger.exception("Note index load failed")
+            return
+
+        while not self._stop.wait(self.refresh_interval):
+            try:
+                self._with_session(self.index.refresh)
+            except NoteIndexFull as exc:
+                self._disable(exc)
+                return
+            except Exception:
+                logger.exception("Note index refresh failed")
+
+    def apply(self, changes):
+        if not self.available:
+            return
+
+        try:
+            for note_id, embedding in changes.items():
+                if embedding is None:
+                    self.index.remove(note_id)
+                else:
+                    self.index.upsert(note_id, embedding)
+
+        except NoteIndexFull as exc:
+            self._disable(exc)
+
+    def stats(self):
+        return {
+            **self.index.stats(),
+            "available": self.available,
+            "disabled_reason": self.disabled_reason
+        }
+
+
+note_index = NoteIndexService(
+    NoteVectorIndex(dtype=NOTE_INDEX_DTYPE),
+    NOTE_INDEX_REFRESH_SECONDS
+) if NOTE_INDEX_ENABLED else None
+
+
+# Apply note changes committed in this process right away; other
+# processes' changes arrive through the periodic refresh.
+@event.listens_for(Session, "after_flush")
+def _collect_note_changes(session, flush_context):
+    if note_index is None:
+        return
+
+    changes = session.info.setdefault("note_index_changes", {})
+
+    for obj in list(session.new) + list(session.dirty):
+        if not isinstance(obj, Note):
+            continue
+
+        # Read loaded values only; anything unloaded is left to refresh()
+        values = inspect(obj).dict
+
+        if not all(attr in values for attr in ("id", "is_private", "status", "embedding")):
+            continue
+
+        searchable = (
+            values["is_private"] is False
+            and values["status"] == "ready"
+            and values["embedding"] is not None
+        )
+        changes[str(values["id"])] = values["embedding"] if searchable else None
+
+    for obj in session.deleted:
+        if isinstance(obj, Note):
+            changes[str(obj.id)] = None
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_note_changes(session):
+    changes = session.info.pop("note_index_changes", None)
+
+    if changes and note_index is not None:
+        note_index.apply(changes)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_note_changes(session):
+    session.info.pop("note_index_changes", None)
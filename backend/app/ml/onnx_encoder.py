@@ -0,0 +1,92 @@
+import json
+import os
+
+import numpy as np
+
+from app.core.config import ONNX_MODEL_DIR, ONNX_INTRA_OP_THREADS
+
+
+CONFIG_FILE = "encoder_config.json"
+TOKENIZER_FILE = "tokenizer.json"
+
+
+def model_dir(model_name: str, root: str = ONNX_MODEL_DIR) -> str:
+    return os.path.join(root, model_name.replace("/", "__"))
+
+
+class OnnxEncoder:
+    """Sentence encoder over an exported transformer: tokenizers for the
+    input, ONNX Runtime for the forward pass, then the same mean pooling
+    and L2 normalization as the sentence-transformers pipeline. Neither
+    torch nor transformers is imported."""
+
+    def __init__(self, path: str, threads: int = ONNX_INTRA_OP_THREADS):
+        # Optional dependencies, only needed with EMBEDDING_BACKEND=onnx
+        import onnxruntime
+        from tokenizers import Tokenizer
+
+        with open(os.path.join(path, CONFIG_FILE)) as f:
+            self.config = json.load(f)
+
+        self.tokenizer = Tokenizer.from_file(os.path.join(path, TOKENIZER_FILE))
+        self.tokenizer.enable_truncation(max_length=self.config["max_seq_length"])
+        self.tokenizer.enable_padding(
+            pad_id=self.config["pad_token_id"],
+            pad_token=self.config["pad_token"]
+        )
+
+        options = onnxruntime.SessionOptions()
+        options.intra_op_num_threads = threads
+        options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+
+        self.session = onnxruntime.InferenceSession(
+            os.path.join(path, self.config["model_file"]),
+            sess_options=options,
+            providers=["CPUExecutionProvider"]
+        )
+
+        self.input_names = [i.name for i in self.session.get_inputs()]
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.config["dimension"]
+
+    def _encode(self, texts):
+        encodings = self.tokenizer.encode_batch(texts)
+
+        inputs = {
+            "input_ids": np.array([e.ids for e in encodings], dtype=np.int64),
+            "attention_mask": np.array([e.attention_mask for e in encodings], dtype=np.int64),
+            "token_type_ids": np.array([e.type_ids for e in encodings], dtype=np.int64)
+        }
+
+        hidden = self.session.run(None, {name: inputs[name] for name in self.input_names})[0]
+
+        # Mean over real tokens only
+        mask = inputs["attention_mask"][:, :, None].astype(np.float32)
+        embeddings = (hidden * mask).sum(axis=1) / np.maximum(mask.sum(axis=1), 1e-9)
+
+        if self.config["normalize"]:
+            norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+            embeddings = embeddings / np.maximum(norms, 1e-12)
+
+        return embeddings
+
+    def encode(self, texts, batch_size: int = 32):
+        # Same call shape as SentenceTransformer.encode for list input
+        if not texts:
+            return np.empty((0, self.get_sentence_embedding_dimension()), dtype=np.float32)
+
+        # Batch similar lengths together to cut padding, as
+        # sentence-transformers does, then restore the input order
+        order = sorted(range(len(texts)), key=lambda i: -len(texts[i]))
+        ordered = [texts[i] for i in order]
+
+        embeddings = np.vstack([
+            self._encode(ordered[start:start + batch_size])
+            for start in range(0, len(ordered), batch_size)
+        ])
+
+        result = np.empty_like(embeddings)
+        result[order] = embeddings
+
+        return result
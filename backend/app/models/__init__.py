@@ -1,2 +1,10 @@
 from .user import User
-from .note import Note
\ No newline at end of file
+from .note import Note
+from .ingestion_job import IngestionJob
+from .note_chunk import NoteChunk
+from .ai_note import AINote
+from .challenge import Challenge
+from .demand_log import DemandLog
+from .embedding_migration import EmbeddingMigration
+from .file_blob import FileBlob
+from .search_corpus import SearchCorpus
@@ -0,0 +1,33 @@
+from sqlalchemy import Column, String, DateTime, Text
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy.sql import func
+import uuid
+
+from app.db.base import Base
+
+
+class AINote(Base):
+    __tablename__ = "ai_notes"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+
+    topic_key = Column(String, unique=True, nullable=False)
+
+    # query that triggered the latest generation
+    topic = Column(String, nullable=False)
+
+    # generating -> ready / failed; a stale "ready" summary is kept and
+    # served while it is being regenerated
+    status = Column(String(20), nullable=False, default="generating")
+
+    summary = Column(Text)
+
+    sources = Column(JSONB)
+
+    generated_at = Column(DateTime(timezone=True))
+
+    updated_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now()
+    )
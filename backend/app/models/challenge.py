@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, Boolean
+from sqlalchemy import Column, String, Integer, Boolean, Index
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
 
@@ -18,4 +18,20 @@ class Challenge(Base):
 
     days_active = Column(Integer, default=1)
 
-    is_active = Column(Boolean, default=True)
\ No newline at end of file
+    is_active = Column(Boolean, default=True)
+
+    __table_args__ = (
+        # Challenge board: keyset pagination over active challenges
+        Index(
+            "ix_challenges_active_reward",
+            reward_credits.desc(),
+            id,
+            postgresql_where=is_active
+        ),
+        Index(
+            "ix_challenges_active_topic_prefix",
+            topic_key,
+            postgresql_ops={"topic_key": "text_pattern_ops"},
+            postgresql_where=is_active
+        ),
+    )
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Date, ForeignKey, String, UniqueConstraint
+from sqlalchemy import Column, Date, ForeignKey, Index, Integer, String, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 import uuid
@@ -14,7 +14,7 @@ class DemandLog(Base):
     query = Column(String, nullable=False)
     topic_key = Column(String, nullable=False)
 
-    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
 
     search_date = Column(Date, nullable=False)
 
@@ -25,4 +25,9 @@ class DemandLog(Base):
             "search_date",
             name="unique_user_topic_day"
         ),
+        Index(
+            "ix_demand_logs_topic_key_search_date",
+            "topic_key",
+            "search_date"
+        ),
     )
\ No newline at end of file
@@ -0,0 +1,43 @@
+from sqlalchemy import Column, String, Integer, DateTime, Index
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+
+from app.db.base import Base
+
+
+class EmbeddingMigration(Base):
+    __tablename__ = "embedding_migrations"
+
+    id = Column(Integer, primary_key=True)
+
+    model_name = Column(String, nullable=False)
+
+    dimensions = Column(Integer, nullable=False)
+
+    # backfilling -> indexing -> ready -> active -> retired, or aborted.
+    # The "active" row names the model notes.embedding was built with.
+    status = Column(String(20), nullable=False, default="backfilling")
+
+    # Keyset checkpoint: last notes.id written to the shadow column
+    cursor = Column(UUID(as_uuid=True))
+
+    processed = Column(Integer, nullable=False, default=0)
+
+    switched_at = Column(DateTime(timezone=True))
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    updated_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now()
+    )
+
+    __table_args__ = (
+        Index(
+            "ix_embedding_migrations_active",
+            status,
+            unique=True,
+            postgresql_where=status == "active"
+        ),
+    )
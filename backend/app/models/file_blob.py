@@ -0,0 +1,20 @@
+from sqlalchemy import Column, String, Integer, BigInteger, DateTime
+from sqlalchemy.sql import func
+
+from app.db.base import Base
+
+
+class FileBlob(Base):
+    __tablename__ = "file_blobs"
+
+    # SHA-256 of the file; the blob lives under UPLOAD_DIR/blobs by hash
+    content_hash = Column(String(64), primary_key=True)
+
+    path = Column(String, nullable=False)
+
+    size = Column(BigInteger, nullable=False)
+
+    # Notes whose file_path points at this blob
+    ref_count = Column(Integer, nullable=False, default=1)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -1,11 +1,13 @@
 import uuid
 
-from sqlalchemy import Column, String, Integer, DateTime, Boolean, Float
+from sqlalchemy import Column, String, Integer, DateTime, Boolean, Float, Index, ForeignKey, Text, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 from pgvector.sqlalchemy import Vector
 
+from app.core.config import EMBEDDING_DIM, HNSW_M, HNSW_EF_CONSTRUCTION
 from app.db.base import Base
+from app.db.vector_index import NOTES_EMBEDDING_INDEX
 
 
 class Note(Base):
@@ -15,18 +17,35 @@ class Note(Base):
 
     title = Column(String(255), nullable=False)
 
+    description = Column(Text, default="")
+
     subject = Column(String(30), nullable=False)
 
+    content_type = Column(String)
+
     file_type = Column(String, nullable=False)
 
     file_path = Column(String, nullable=False)
 
     file_size = Column(Integer)
 
+    # SHA-256 of the uploaded file; bulk imports skip files already imported
+    content_hash = Column(String(64))
+
     page_count = Column(Integer)
 
+    user_id = Column(Integer, ForeignKey("users.id"), index=True)
+
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
+    # Bumped by ORM updates only; batched counter flushes leave it alone
+    updated_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        index=True
+    )
+
     upvotes = Column(Integer, default=0)
 
     download_count = Column(Integer, default=0)
@@ -39,4 +58,45 @@ class Note(Base):
 
     is_private = Column(Boolean, default=True)
 
-    embedding = Column(Vector(384))
\ No newline at end of file
+    # processing -> ready / failed, driven by the ingestion workers
+    status = Column(String(20), nullable=False, default="ready", server_default="ready")
+
+    processing_error = Column(Text)
+
+    extracted_text = Column(Text)
+
+    embedding = Column(Vector(EMBEDDING_DIM))
+
+    __table_args__ = (
+        Index(
+            NOTES_EMBEDDING_INDEX,
+            "embedding",
+            postgresql_using="hnsw",
+            postgresql_with={
+                "m": HNSW_M,
+                "ef_construction": HNSW_EF_CONSTRUCTION
+            },
+            postgresql_ops={"embedding": "vector_cosine_ops"}
+        ),
+        # Selective search filters: the planner can pick these and sort the
+        # few matching rows exactly instead of walking the vector graph
+        Index(
+            "ix_notes_public_subject_created_at",
+            "subject",
+            "created_at",
+            postgresql_where=text("is_private = false AND status = 'ready'")
+        ),
+        Index(
+            "ix_notes_public_user_created_at",
+            "user_id",
+            "created_at",
+            postgresql_where=text("is_private = false AND status = 'ready'")
+        ),
+        # Import dedup per user, and reuse of a file's processed copy
+        Index("ix_notes_user_content_hash", "user_id", "content_hash"),
+        Index(
+            "ix_notes_ready_content_hash",
+            "content_hash",
+            postgresql_where=text("status = 'ready'")
+        ),
+    )
\ No newline at end of file
@@ -0,0 +1,40 @@
+from sqlalchemy import Column, Integer, ForeignKey, Text, Index
+from sqlalchemy.dialects.postgresql import UUID
+from pgvector.sqlalchemy import Vector
+import uuid
+
+from app.core.config import EMBEDDING_DIM, HNSW_M, HNSW_EF_CONSTRUCTION
+from app.db.base import Base
+from app.db.vector_index import NOTE_CHUNKS_EMBEDDING_INDEX
+
+
+class NoteChunk(Base):
+    __tablename__ = "note_chunks"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+
+    note_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("notes.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True
+    )
+
+    chunk_index = Column(Integer, nullable=False)
+
+    content = Column(Text, nullable=False)
+
+    embedding = Column(Vector(EMBEDDING_DIM), nullable=False)
+
+    __table_args__ = (
+        Index(
+            NOTE_CHUNKS_EMBEDDING_INDEX,
+            "embedding",
+            postgresql_using="hnsw",
+            postgresql_with={
+                "m": HNSW_M,
+                "ef_construction": HNSW_EF_CONSTRUCTION
+            },
+            postgresql_ops={"embedding": "vector_cosine_ops"}
+        ),
+    )
@@ -0,0 +1,14 @@
+from sqlalchemy import Column, Integer, BigInteger
+
+from app.db.base import Base
+
+
+class SearchCorpus(Base):
+    __tablename__ = "search_corpus"
+
+    # A single row (id 1), created by the first bump
+    id = Column(Integer, primary_key=True)
+
+    # Bumped in every transaction that changes the searchable note set;
+    # cached search results are valid for one version only
+    version = Column(BigInteger, nullable=False, default=0)
@@ -0,0 +1,54 @@
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import EMBEDDING_MODEL_NAME, ACTIVE_MODEL_TTL_SECONDS
+from app.utils.ttl_cache import TTLCache
+
+
+ACTIVE_MODEL_SQL = "SELECT model_name FROM embedding_migrations WHERE status = 'active'"
+
+# Search statements carry this guard, so a query encoded with a model
+# that has just been switched out matches nothing instead of matching
+# vectors from a different embedding space
+ACTIVE_MODEL_GUARD = (
+    "NOT EXISTS (SELECT 1 FROM embedding_migrations "
+    "WHERE status = 'active' AND model_name <> :model_name)"
+)
+
+active_model_cache = TTLCache(maxsize=1, ttl=ACTIVE_MODEL_TTL_SECONDS)
+
+
+async def get_active_model(db: AsyncSession, refresh: bool = False) -> str:
+    # Model that notes.embedding / note_chunks.embedding were built with
+    name = None if refresh else active_model_cache.get("active")
+
+    if name is None:
+        row = (await db.execute(text(ACTIVE_MODEL_SQL))).fetchone()
+        name = row.model_name if row else EMBEDDING_MODEL_NAME
+        active_model_cache.set("active", name)
+
+    return name
+
+
+def read_active_model(db: Session) -> str:
+    # Unlocked; writers check it again under lock_active_model
+    row = db.execute(text(ACTIVE_MODEL_SQL)).fetchone()
+    return row.model_name if row else EMBEDDING_MODEL_NAME
+
+
+def lock_active_model(db: Session) -> str:
+    # Writers of embeddings call this first in their transaction: a model
+    # switch waits for them, and they wait for a switch in progress
+    for _ in range(2):
+        row = db.execute(text(ACTIVE_MODEL_SQL + " FOR SHARE")).fetchone()
+
+        # None right after a switch committed under us: read again
+        if row is not None:
+            return row.model_name
+
+    return EMBEDDING_MODEL_NAME
+
+
+def invalidate_active_model():
+    active_model_cache.clear()
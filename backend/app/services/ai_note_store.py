@@ -0,0 +1,116 @@
+import asyncio
+import logging
+import uuid
+
+from sqlalchemy import func, text
+from sqlalchemy.orm import Session
+
+from app.core.config import (
+    AI_NOTES_FRESHNESS_SECONDS,
+    AI_NOTES_GENERATION_LEASE_SECONDS,
+    AI_NOTES_RETRY_SECONDS
+)
+from app.db.session import SessionLocal
+from app.models.ai_note import AINote
+from app.services.ai_notes import generate_ai_notes
+
+
+logger = logging.getLogger(__name__)
+
+
+# Single flight across all workers: the row for a topic_key can only be
+# moved to "generating" by one caller at a time, and only when there is
+# nothing usable (missing, stale, failed and cooled down, or abandoned).
+CLAIM_SQL = text("""
+    INSERT INTO ai_notes (id, topic_key, topic, status, updated_at)
+    VALUES (:id, :topic_key, :topic, 'generating', now())
+    ON CONFLICT (topic_key) DO UPDATE
+    SET
+        status = 'generating',
+        topic = EXCLUDED.topic,
+        updated_at = now()
+    WHERE (
+            ai_notes.status = 'ready'
+            AND ai_notes.generated_at < now() - make_interval(secs => :freshness)
+        )
+       OR (
+            ai_notes.status = 'failed'
+            AND ai_notes.updated_at < now() - make_interval(secs => :retry)
+        )
+       OR (
+            ai_notes.status = 'generating'
+            AND ai_notes.updated_at < now() - make_interval(secs => :lease)
+        )
+    RETURNING id
+""")
+
+
+def serialize_ai_note(ai_note: AINote):
+    if ai_note is None or not ai_note.summary:
+        return None
+
+    return {
+        "topic": ai_note.topic,
+        "summary": ai_note.summary,
+        "sources": ai_note.sources or [],
+        "generated_at": ai_note.generated_at
+    }
+
+
+def claim_ai_note(db: Session, topic_key: str, topic: str):
+    # Returns (row, claimed); claimed means the caller must generate
+    claimed = db.execute(
+        CLAIM_SQL,
+        {
+            "id": uuid.uuid4(),
+            "topic_key": topic_key,
+            "topic": topic,
+            "freshness": AI_NOTES_FRESHNESS_SECONDS,
+            "retry": AI_NOTES_RETRY_SECONDS,
+            "lease": AI_NOTES_GENERATION_LEASE_SECONDS
+        }
+    ).fetchone() is not None
+
+    db.commit()
+
+    ai_note = db.query(AINote).filter(AINote.topic_key == topic_key).first()
+
+    return ai_note, claimed
+
+
+def get_ai_note(db: Session, topic_key: str):
+    return db.query(AINote).filter(AINote.topic_key == topic_key).first()
+
+
+def _store_result(topic_key: str, note):
+    db = SessionLocal()
+
+    try:
+        ai_note = get_ai_note(db, topic_key)
+
+        if ai_note is None:
+            return
+
+        if note:
+            ai_note.status = "ready"
+            ai_note.summary = note["summary"]
+            ai_note.sources = note["sources"]
+            ai_note.generated_at = func.now()
+        else:
+            ai_note.status = "failed"
+
+        db.commit()
+
+    finally:
+        db.close()
+
+
+async def refresh_ai_note(topic_key: str, topic: str):
+    try:
+        note = await generate_ai_notes(topic)
+
+    except Exception:
+        logger.exception("AI note generation failed for %r", topic_key)
+        note = None
+
+    await asyncio.to_thread(_store_result, topic_key, note)
@@ -1,30 +1,81 @@
+import asyncio
+import time
+
+from app.core.config import (
+    AI_NOTES_MAX_SOURCES,
+    AI_NOTES_URL_TIMEOUT_SECONDS,
+    AI_NOTES_FETCH_DEADLINE_SECONDS,
+    AI_NOTES_DEADLINE_SECONDS
+)
 from app.services.scraper import extract_text
 from app.services.ai_summarizer import summarize_text
 from app.services.web_search import search_web
 
 
-def generate_ai_notes(topic: str):
+async def _fetch(url: str):
+    try:
+        return await asyncio.wait_for(
+            asyncio.to_thread(extract_text, url),
+            timeout=AI_NOTES_URL_TIMEOUT_SECONDS
+        )
+    except Exception:
+        return None
+
+
+async def generate_ai_notes(topic: str, deadline: float = AI_NOTES_DEADLINE_SECONDS):
+
+    started = time.monotonic()
+
+    def remaining():
+        return deadline - (time.monotonic() - started)
+
+    urls = await asyncio.wait_for(
+        asyncio.to_thread(search_web, topic),
+        timeout=remaining()
+    )
+
+    urls = urls[:AI_NOTES_MAX_SOURCES]
+
+    # Fetch all sources at once; keep whatever arrived by the fetch deadline
+    fetches = {asyncio.create_task(_fetch(url)): url for url in urls}
+
+    if not fetches:
+        return None
+
+    done, pending = await asyncio.wait(
+        fetches,
+        timeout=min(AI_NOTES_FETCH_DEADLINE_SECONDS, remaining())
+    )
 
-    urls = search_web(topic)
+    for task in pending:
+        task.cancel()
 
     collected_text = []
+    sources = []
 
-    for url in urls[:5]:
+    # Preserve search ranking order
+    for task, url in fetches.items():
+        if task not in done:
+            continue
 
-        text = extract_text(url)
+        text = task.result()
 
         if text:
             collected_text.append(text[:4000])
+            sources.append(url)
 
     if not collected_text:
         return None
 
     combined_text = "\n".join(collected_text)
 
-    summary = summarize_text(topic, combined_text)
+    summary = await asyncio.wait_for(
+        asyncio.to_thread(summarize_text, topic, combined_text),
+        timeout=max(remaining(), 0)
+    )
 
     return {
         "topic": topic,
         "summary": summary,
-        "sources": urls[:5]
-    }
\ No newline at end of file
+        "sources": sources
+    }
@@ -0,0 +1,179 @@
+import hashlib
+import os
+import tempfile
+from typing import NamedTuple, Optional
+
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+
+from app.core.config import UPLOAD_DIR, UPLOAD_MAX_BYTES
+
+
+COPY_BLOCK_SIZE = 1024 * 1024
+
+# Uploaded files, stored once per distinct content under their SHA-256
+BLOB_DIR = os.path.join(UPLOAD_DIR, "blobs")
+# Uploads being received; same filesystem, so keeping one is a rename
+INCOMING_DIR = os.path.join(BLOB_DIR, "incoming")
+
+
+class UploadTooLarge(Exception):
+    pass
+
+
+class StoredFile(NamedTuple):
+    source: str
+    file_path: str
+    file_size: int
+    content_hash: str
+
+
+# The row stays locked until the caller commits, so a release of the
+# last reference can't remove the file in between. created: this call
+# inserted the row, rather than adding to an existing one.
+RETAIN_SQL = text("""
+    INSERT INTO file_blobs (content_hash, path, size, ref_count)
+    VALUES (:content_hash, :path, :size, 1)
+    ON CONFLICT (content_hash) DO UPDATE
+    SET ref_count = file_blobs.ref_count + 1
+    RETURNING path, (xmax = 0) AS created
+""")
+
+RELEASE_SQL = text("""
+    UPDATE file_blobs
+    SET ref_count = ref_count - 1
+    WHERE content_hash = :content_hash
+      AND path = :path
+    RETURNING ref_count
+""")
+
+
+def blob_path(content_hash: str) -> str:
+    # ab/cd/abcd...: two levels of 256 directories keep each one small
+    return os.path.join(BLOB_DIR, content_hash[:2], content_hash[2:4], content_hash)
+
+
+def receive_file(fileobj, source: str, max_bytes: Optional[int] = UPLOAD_MAX_BYTES) -> StoredFile:
+    # Streams into INCOMING_DIR and hashes in the same pass, stopping as
+    # soon as the file passes max_bytes. file_path is the incoming copy
+    # until retain_blob keeps it.
+    os.makedirs(INCOMING_DIR, exist_ok=True)
+
+    fd, file_path = tempfile.mkstemp(dir=INCOMING_DIR)
+    digest = hashlib.sha256()
+    size = 0
+
+    try:
+        with os.fdopen(fd, "wb") as buffer:
+            for block in iter(lambda: fileobj.read(COPY_BLOCK_SIZE), b""):
+                size += len(block)
+
+                if max_bytes is not None and size > max_bytes:
+                    raise UploadTooLarge(f"File exceeds {max_bytes / (1024 * 1024):g} MB")
+
+                digest.update(block)
+                buffer.write(block)
+    except BaseException:
+        os.remove(file_path)
+        raise
+
+    return StoredFile(source, file_path, size, digest.hexdigest())
+
+
+def discard_incoming(stored: StoredFile):
+    # A received file that won't be kept
+    if os.path.exists(stored.file_path):
+        os.remove(stored.file_path)
+
+
+def retain_blob(db: Session, stored: StoredFile) -> StoredFile:
+    # Adds a reference to the file's blob. The first one moves the
+    # incoming copy into place; a duplicate just drops it. A blob placed
+    # here is removed again if the transaction doesn't commit.
+    try:
+        row = db.execute(
+            RETAIN_SQL,
+            {
+                "content_hash": stored.content_hash,
+                "path": blob_path(stored.content_hash),
+                "size": stored.file_size
+            }
+        ).one()
+    except BaseException:
+        discard_incoming(stored)
+        raise
+
+    if not row.created and os.path.exists(row.path):
+        discard_incoming(stored)
+    else:
+        os.makedirs(os.path.dirname(row.path), exist_ok=True)
+        os.replace(stored.file_path, row.path)
+
+        # By inode: once this transaction's row lock is gone, another
+        # upload of the same file may put its own copy at the path
+        db.info.setdefault("placed_blobs", []).append(
+            (row.path, os.stat(row.path).st_ino)
+        )
+
+    return stored._replace(file_path=row.path)
+
+
+def _remove_blob(path: str, inode: int):
+    # Only the copy that was there when it was recorded
+    try:
+        if os.stat(path).st_ino == inode:
+            os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_blob_changes(session):
+    session.info.pop("placed_blobs", None)
+
+    for path, inode in session.info.pop("released_blobs", ()):
+        _remove_blob(path, inode)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _undo_blob_changes(session, transaction):
+    # Rolled back, or the session closed without committing: nothing
+    # references the blobs this transaction placed, and the ones it
+    # released are referenced again
+    if transaction.parent is not None:
+        return
+
+    for path, inode in session.info.pop("placed_blobs", ()):
+        _remove_blob(path, inode)
+
+    session.info.pop("released_blobs", None)
+
+
+def release_blob(db: Session, content_hash: Optional[str], file_path: str):
+    # Drops a note's reference; the last one removes the blob once the
+    # caller commits. Files stored before content addressing have no
+    # blob row and one owner.
+    row = None
+
+    if content_hash is not None:
+        row = db.execute(
+            RELEASE_SQL,
+            {"content_hash": content_hash, "path": file_path}
+        ).fetchone()
+
+    if row is not None:
+        if row.ref_count > 0:
+            return
+
+        db.execute(
+            text("DELETE FROM file_blobs WHERE content_hash = :content_hash"),
+            {"content_hash": content_hash}
+        )
+
+    # Recorded while the row is locked. After the commit, an upload of
+    # the same file that was waiting on it stores its own copy, which
+    # has another inode and is left alone.
+    if os.path.exists(file_path):
+        db.info.setdefault("released_blobs", []).append(
+            (file_path, os.stat(file_path).st_ino)
+        )
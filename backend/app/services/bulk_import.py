@@ -0,0 +1,195 @@
+import hashlib
+import os
+import uuid
+from typing import NamedTuple
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.core.config import NOTE_TEXT_MAX_CHARS, CHUNK_TEXT_MAX_CHARS
+from app.models.ingestion_job import IngestionJob
+from app.models.note import Note
+from app.models.note_chunk import NoteChunk
+from app.services.active_model import lock_active_model
+from app.services.blob_store import COPY_BLOCK_SIZE, StoredFile, discard_incoming, retain_blob
+from app.services.ingestion import encode_notes, find_processed, reuse_processed
+from app.utils.pdf_utils import extract_pdf
+
+
+class ImportOptions(NamedTuple):
+    subject: str
+    content_type: str
+    description: str = ""
+    is_private: bool = True
+
+
+def file_sha256(fileobj) -> str:
+    digest = hashlib.sha256()
+
+    for block in iter(lambda: fileobj.read(COPY_BLOCK_SIZE), b""):
+        digest.update(block)
+
+    return digest.hexdigest()
+
+
+def find_imported(db: Session, user_id: int, hashes):
+    # content hash -> id of the user's note already holding that file
+    if not hashes:
+        return {}
+
+    rows = db.query(Note.content_hash, Note.id).filter(
+        Note.user_id == user_id,
+        Note.content_hash.in_(list(hashes)),
+        Note.status != "failed"
+    )
+
+    return {row.content_hash: row.id for row in rows}
+
+
+def import_result(source: str, status: str, note_id=None, error: str = None):
+    return {
+        "source": source,
+        "status": status,
+        "note_id": str(note_id) if note_id is not None else None,
+        "error": error
+    }
+
+
+def _skip_imported(db: Session, stored_files, user_id: int, results):
+    # Drops files this user already imported (by an earlier, possibly
+    # interrupted run, or earlier in this one); re-running an import
+    # therefore resumes where it stopped
+    imported = find_imported(db, user_id, {f.content_hash for f in stored_files})
+    fresh = []
+
+    for stored in stored_files:
+        if stored.content_hash in imported:
+            discard_incoming(stored)
+            results.append(import_result(
+                stored.source,
+                "skipped",
+                imported[stored.content_hash],
+                "Already imported"
+            ))
+            continue
+
+        imported[stored.content_hash] = None
+        fresh.append(stored)
+
+    return fresh
+
+
+def _new_note(stored: StoredFile, user_id: int, options: ImportOptions, status: str) -> Note:
+    # Client-side ids, so a batch goes out as one multi-row INSERT and
+    # chunk rows can reference their notes before the flush
+    return Note(
+        id=uuid.uuid4(),
+        title=os.path.splitext(os.path.basename(stored.source))[0][:255],
+        description=options.description,
+        subject=options.subject,
+        content_type=options.content_type,
+        is_private=options.is_private,
+        file_type="application/pdf",
+        file_path=stored.file_path,
+        file_size=stored.file_size,
+        content_hash=stored.content_hash,
+        user_id=user_id,
+        status=status,
+        view_count=0,
+        download_count=0,
+        upvotes=0
+    )
+
+
+def queue_files(db: Session, stored_files, user_id: int, options: ImportOptions):
+    # Endpoint path: insert the notes and their ingestion jobs, leaving
+    # extraction and embedding to the ingestion workers. stored_files are
+    # received (incoming) files. Caller commits.
+    results = []
+
+    items = []
+
+    for stored in _skip_imported(db, stored_files, user_id, results):
+        stored = retain_blob(db, stored)
+        items.append((stored, _new_note(stored, user_id, options, "processing")))
+
+    db.add_all([note for _, note in items])
+    db.flush()
+
+    db.add_all([IngestionJob(note_id=note.id, status="pending") for _, note in items])
+    db.flush()
+
+    for stored, note in items:
+        results.append(import_result(stored.source, "queued", note.id))
+
+    return results
+
+
+def import_files(db: Session, stored_files, user_id: int, options: ImportOptions, executor):
+    # CLI path: extract the batch across the process pool, encode notes
+    # and chunks together, then one multi-row INSERT each. Files already
+    # processed for another note are copied from it. Caller commits.
+    model_name = lock_active_model(db)
+    results = []
+
+    fresh = _skip_imported(db, stored_files, user_id, results)
+    sources = find_processed(db, {stored.content_hash for stored in fresh})
+
+    pending = [
+        (
+            stored,
+            executor.submit(
+                extract_pdf,
+                stored.file_path,
+                max(NOTE_TEXT_MAX_CHARS, CHUNK_TEXT_MAX_CHARS)
+            )
+        )
+        for stored in fresh
+        if stored.content_hash not in sources
+    ]
+
+    items = []
+    reused = []
+
+    for stored in fresh:
+        if stored.content_hash in sources:
+            stored = retain_blob(db, stored)
+            note = _new_note(stored, user_id, options, "ready")
+            reused.append((stored, note, sources[stored.content_hash]))
+
+    for stored, future in pending:
+        try:
+            pdf = future.result()
+        except Exception:
+            discard_incoming(stored)
+            results.append(import_result(stored.source, "failed", error="Failed to extract PDF text"))
+            continue
+
+        if not pdf.text.strip():
+            discard_incoming(stored)
+            results.append(import_result(stored.source, "failed", error="PDF contains no readable text"))
+            continue
+
+        stored = retain_blob(db, stored)
+        note = _new_note(stored, user_id, options, "ready")
+        note.page_count = pdf.page_count
+
+        items.append((stored, note, pdf.text))
+
+    chunk_rows = encode_notes(
+        [(note, note_text) for _, note, note_text in items],
+        model_name
+    )
+
+    db.add_all([note for _, note, _ in items + reused])
+    db.flush()
+
+    if chunk_rows:
+        db.execute(insert(NoteChunk), chunk_rows)
+
+    reuse_processed(db, [(note, source) for _, note, source in reused], model_name)
+
+    for stored, note, _ in items + reused:
+        results.append(import_result(stored.source, "imported", note.id))
+
+    return results
@@ -0,0 +1,110 @@
+import base64
+import json
+import uuid
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import CHALLENGE_FIRST_PAGE_TTL_SECONDS
+from app.utils.ttl_cache import TTLCache
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+# First pages only: (limit, topic_prefix) -> response body
+first_page_cache = TTLCache(maxsize=256, ttl=CHALLENGE_FIRST_PAGE_TTL_SECONDS)
+
+
+def invalidate_challenge_listing():
+    # Called when a challenge is created or closed in this process; other
+    # workers, and reward changes, catch up within
+    # CHALLENGE_FIRST_PAGE_TTL_SECONDS
+    first_page_cache.clear()
+
+
+def encode_cursor(reward_credits: int, challenge_id) -> str:
+    raw = json.dumps([reward_credits, str(challenge_id)])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        reward_credits, challenge_id = json.loads(base64.urlsafe_b64decode(padded))
+        return int(reward_credits), uuid.UUID(challenge_id)
+    except (ValueError, TypeError):
+        raise InvalidCursor("Invalid cursor")
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+# Walks ix_challenges_active_reward (reward_credits DESC, id) WHERE is_active
+LIST_SQL = """
+    SELECT id, topic_key, reward_credits, demand_count, days_active
+    FROM challenges
+    WHERE is_active = true
+      {filters}
+    ORDER BY reward_credits DESC, id
+    LIMIT :limit
+"""
+
+
+async def list_challenges(db: AsyncSession, limit: int, cursor: str = None, topic_prefix: str = None):
+
+    cache_key = (limit, topic_prefix)
+
+    if cursor is None:
+        cached = first_page_cache.get(cache_key)
+
+        if cached is not None:
+            return cached
+
+    filters = []
+    params = {"limit": limit + 1}
+
+    if cursor is not None:
+        reward_credits, challenge_id = decode_cursor(cursor)
+        filters.append(
+            "AND (reward_credits < :cursor_reward "
+            "OR (reward_credits = :cursor_reward AND id > :cursor_id))"
+        )
+        params["cursor_reward"] = reward_credits
+        params["cursor_id"] = challenge_id
+
+    if topic_prefix:
+        filters.append("AND topic_key LIKE :topic_prefix ESCAPE '\\'")
+        params["topic_prefix"] = _escape_like(topic_prefix) + "%"
+
+    rows = (await db.execute(
+        text(LIST_SQL.format(filters="\n      ".join(filters))),
+        params
+    )).fetchall()
+
+    page = rows[:limit]
+
+    body = {
+        "count": len(page),
+        "challenges": [
+            {
+                "challenge_id": str(c.id),
+                "topic_key": c.topic_key,
+                "reward_credits": c.reward_credits,
+                "demand_count": c.demand_count,
+                "days_active": c.days_active
+            }
+            for c in page
+        ],
+        "next_cursor": (
+            encode_cursor(page[-1].reward_credits, page[-1].id)
+            if len(rows) > limit else None
+        )
+    }
+
+    if cursor is None:
+        first_page_cache.set(cache_key, body)
+
+    return body
@@ -0,0 +1,125 @@
+import uuid
+from datetime import date
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.models.challenge import Challenge
+from app.services.challenge_listing import invalidate_challenge_listing
+
+
+BASE_REWARD = 50
+DEMAND_WEIGHT = 5
+DAY_WEIGHT = 10
+
+
+# One statement per miss, independent of how many logs the topic has:
+# the log insert is idempotent per (user, topic, day), and the challenge
+# counters move only when that insert actually added a row. days_active
+# moves when the row is the topic's first for the day; two first-of-day
+# misses racing each other can both count it, which the reconciliation
+# job corrects.
+RECORD_DEMAND_SQL = text("""
+    WITH new_day AS (
+        SELECT NOT EXISTS (
+            SELECT 1
+            FROM demand_logs
+            WHERE topic_key = :topic_key
+              AND search_date = :search_date
+        ) AS is_new
+    ),
+    logged AS (
+        INSERT INTO demand_logs (id, query, topic_key, user_id, search_date)
+        VALUES (:log_id, :query, :topic_key, :user_id, :search_date)
+        ON CONFLICT ON CONSTRAINT unique_user_topic_day DO NOTHING
+        RETURNING 1
+    )
+    INSERT INTO challenges AS c (
+        id, topic_key, reward_credits, demand_count, days_active, is_active
+    )
+    SELECT
+        :challenge_id,
+        :topic_key,
+        :base_reward + :demand_weight + :day_weight,
+        1,
+        1,
+        true
+    FROM logged
+    ON CONFLICT (topic_key) DO UPDATE
+    SET
+        demand_count = c.demand_count + 1,
+        days_active = c.days_active + (SELECT is_new::int FROM new_day),
+        reward_credits = :base_reward
+            + (c.demand_count + 1) * :demand_weight
+            + (c.days_active + (SELECT is_new::int FROM new_day)) * :day_weight
+    WHERE c.is_active
+    RETURNING c.id, c.topic_key, c.reward_credits, c.demand_count, c.days_active
+""")
+
+
+RECONCILE_SQL = text("""
+    UPDATE challenges c
+    SET
+        demand_count = s.demand_count,
+        days_active = s.days_active,
+        reward_credits = :base_reward
+            + s.demand_count * :demand_weight
+            + s.days_active * :day_weight
+    FROM (
+        SELECT
+            topic_key,
+            COUNT(*) AS demand_count,
+            COUNT(DISTINCT search_date) AS days_active
+        FROM demand_logs
+        GROUP BY topic_key
+    ) s
+    WHERE c.topic_key = s.topic_key
+      AND c.is_active
+      AND (c.demand_count, c.days_active)
+          IS DISTINCT FROM (s.demand_count, s.days_active)
+""")
+
+
+REWARD_PARAMS = {
+    "base_reward": BASE_REWARD,
+    "demand_weight": DEMAND_WEIGHT,
+    "day_weight": DAY_WEIGHT
+}
+
+
+def record_demand(db: Session, query: str, topic_key: str, user_id):
+
+    challenge = db.execute(
+        RECORD_DEMAND_SQL,
+        {
+            "log_id": uuid.uuid4(),
+            "challenge_id": uuid.uuid4(),
+            "query": query,
+            "topic_key": topic_key,
+            "user_id": user_id,
+            "search_date": date.today(),
+            **REWARD_PARAMS
+        }
+    ).fetchone()
+
+    db.commit()
+
+    # A new challenge joins the board now; reward bumps on existing ones
+    # show up once the cached first page expires
+    if challenge is not None and challenge.demand_count == 1:
+        invalidate_challenge_listing()
+
+    # Repeat search the same day, or the topic's challenge is closed
+    if challenge is None:
+        challenge = db.query(Challenge).filter(
+            Challenge.topic_key == topic_key
+        ).first()
+
+    return challenge
+
+
+def reconcile_demand_stats(db: Session) -> int:
+    result = db.execute(RECONCILE_SQL, REWARD_PARAMS)
+    db.commit()
+
+    return result.rowcount
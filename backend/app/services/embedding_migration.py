@@ -0,0 +1,327 @@
+import logging
+import os
+import uuid
+
+from sqlalchemy import func, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.core.config import NOTE_TEXT_MAX_CHARS, NOTE_RETRIEVAL, REEMBED_BATCH_SIZE
+from app.db.vector_index import (
+    NOTES_EMBEDDING_INDEX,
+    NOTE_CHUNKS_EMBEDDING_INDEX,
+    create_index_sql
+)
+from app.models.embedding_migration import EmbeddingMigration
+from app.services.active_model import invalidate_active_model
+from app.services.ingestion import encode_texts, note_embedding_text
+from app.services.search_cache import bump_corpus_version
+from app.utils.pdf_utils import extract_pdf
+
+
+logger = logging.getLogger(__name__)
+
+SHADOW_COLUMN = "embedding_next"
+PREVIOUS_COLUMN = "embedding_prev"
+
+IN_PROGRESS = ("backfilling", "indexing", "ready")
+
+NOTES_BIT_INDEX = "ix_notes_embedding_bit_hnsw"
+
+# table -> HNSW index on its embedding column
+EMBEDDING_TABLES = {
+    "notes": NOTES_EMBEDDING_INDEX,
+    "note_chunks": NOTE_CHUNKS_EMBEDDING_INDEX
+}
+
+START_CURSOR = uuid.UUID(int=0)
+
+
+class MigrationError(Exception):
+    pass
+
+
+def _index_for(index_name: str, column: str) -> str:
+    # ix_notes_embedding_hnsw -> ix_notes_embedding_next_hnsw
+    return index_name.replace("_embedding_", f"_{column}_", 1)
+
+
+# Ready notes whose shadow vector is missing: never written, or their
+# chunks were replaced (re-ingestion) since it was
+PENDING_NOTES_SQL = f"""
+    SELECT n.id, n.title, n.description, n.extracted_text, n.file_path
+    FROM notes n
+    WHERE n.status = 'ready'
+      AND n.id > CAST(:cursor AS uuid)
+      {{pending}}
+    ORDER BY n.id
+    LIMIT :limit
+"""
+
+PENDING_FILTER = f"""AND (
+          n.{SHADOW_COLUMN} IS NULL
+          OR n.id IN (
+              SELECT note_id FROM note_chunks WHERE {SHADOW_COLUMN} IS NULL
+          )
+      )"""
+
+NOTE_CHUNKS_SQL = text("""
+    SELECT id, content
+    FROM note_chunks
+    WHERE note_id = ANY(CAST(:ids AS uuid[]))
+""")
+
+# One statement per batch instead of one UPDATE per row; raw SQL, so
+# notes.updated_at (ORM onupdate) is left alone
+WRITE_SHADOW_SQL = """
+    UPDATE {table} t
+    SET {column} = CAST(v.embedding AS vector)
+    FROM unnest(CAST(:ids AS uuid[]), CAST(:embeddings AS text[])) AS v(id, embedding)
+    WHERE t.id = v.id
+"""
+
+
+def _vector_literal(vector) -> str:
+    return "[" + ",".join(repr(float(x)) for x in vector) + "]"
+
+
+def _note_text(row) -> str:
+    if row.extracted_text is not None:
+        return row.extracted_text
+
+    # Notes ingested before extracted text was stored
+    if row.file_path and os.path.exists(row.file_path):
+        try:
+            return extract_pdf(row.file_path, NOTE_TEXT_MAX_CHARS).text
+        except Exception:
+            logger.warning("Could not re-extract note %s", row.id)
+
+    return ""
+
+
+def _write_shadow(db: Session, table: str, ids, vectors):
+    if not ids:
+        return
+
+    db.execute(
+        text(WRITE_SHADOW_SQL.format(table=table, column=SHADOW_COLUMN)),
+        {
+            "ids": [str(i) for i in ids],
+            "embeddings": [_vector_literal(v) for v in vectors]
+        }
+    )
+
+
+def encode_batch(db: Session, rows, model_name: str):
+    # Notes and all of their stored chunks in one encode; text comes from
+    # the database, so no PDF is parsed again
+    chunks = db.execute(
+        NOTE_CHUNKS_SQL,
+        {"ids": [str(row.id) for row in rows]}
+    ).fetchall()
+
+    vectors = encode_texts(
+        [note_embedding_text(row.title, row.description, _note_text(row)) for row in rows]
+        + [chunk.content for chunk in chunks],
+        model_name
+    )
+
+    _write_shadow(db, "notes", [row.id for row in rows], vectors[:len(rows)])
+    _write_shadow(db, "note_chunks", [chunk.id for chunk in chunks], vectors[len(rows):])
+
+
+def get_migration(db: Session):
+    return db.query(EmbeddingMigration).filter(
+        EmbeddingMigration.status.in_(IN_PROGRESS)
+    ).first()
+
+
+def start_migration(db: Session, model_name: str, dimensions: int) -> EmbeddingMigration:
+    migration = get_migration(db)
+
+    if migration is not None:
+        if migration.model_name != model_name:
+            raise MigrationError(
+                f"Migration to {migration.model_name} is in progress; "
+                "finish or abort it first"
+            )
+
+        return migration
+
+    migration = EmbeddingMigration(
+        model_name=model_name,
+        dimensions=dimensions,
+        status="backfilling",
+        processed=0
+    )
+    db.add(migration)
+
+    # Nullable column without a default: a catalog-only change
+    for table in EMBEDDING_TABLES:
+        db.execute(text(f"ALTER TABLE {table} DROP COLUMN IF EXISTS {SHADOW_COLUMN}"))
+        db.execute(text(
+            f"ALTER TABLE {table} ADD COLUMN {SHADOW_COLUMN} vector({int(dimensions)})"
+        ))
+
+    db.commit()
+
+    return migration
+
+
+def run_pass(
+    db: Session,
+    migration: EmbeddingMigration,
+    pending_only: bool = False,
+    batch_size: int = REEMBED_BATCH_SIZE,
+    commit: bool = True,
+    progress=None
+) -> int:
+    # Keyset pass over notes by id. The backfill pass checkpoints its
+    # cursor with every batch, in the same transaction as the vectors.
+    sql = text(PENDING_NOTES_SQL.format(pending=PENDING_FILTER if pending_only else ""))
+
+    cursor = START_CURSOR if pending_only else (migration.cursor or START_CURSOR)
+    done = 0
+
+    while True:
+        rows = db.execute(sql, {"cursor": str(cursor), "limit": batch_size}).fetchall()
+
+        if not rows:
+            break
+
+        encode_batch(db, rows, migration.model_name)
+
+        cursor = rows[-1].id
+        done += len(rows)
+
+        if not pending_only:
+            migration.cursor = cursor
+            migration.processed = migration.processed + len(rows)
+
+        if commit:
+            db.commit()
+
+        if progress is not None:
+            progress(done)
+
+    return done
+
+
+def backfill(db: Session, migration: EmbeddingMigration, batch_size: int = REEMBED_BATCH_SIZE, progress=None):
+    run_pass(db, migration, batch_size=batch_size, progress=progress)
+
+    # Notes ingested or re-ingested while the backfill ran
+    while run_pass(db, migration, pending_only=True, batch_size=batch_size, progress=progress) > batch_size:
+        pass
+
+    migration.status = "indexing"
+    db.commit()
+
+
+def _index_is_valid(conn, index_name: str):
+    row = conn.execute(
+        text("""
+            SELECT i.indisvalid
+            FROM pg_class c
+            JOIN pg_index i ON i.indexrelid = c.oid
+            WHERE c.relname = :name
+        """),
+        {"name": index_name}
+    ).fetchone()
+
+    return None if row is None else row.indisvalid
+
+
+def build_indexes(engine: Engine, db: Session, migration: EmbeddingMigration):
+    statements = [
+        (
+            _index_for(index_name, SHADOW_COLUMN),
+            create_index_sql(_index_for(index_name, SHADOW_COLUMN), table, SHADOW_COLUMN)
+        )
+        for table, index_name in EMBEDDING_TABLES.items()
+    ]
+
+    if NOTE_RETRIEVAL == "binary":
+        bit_index = _index_for(NOTES_BIT_INDEX, SHADOW_COLUMN)
+        statements.append((
+            bit_index,
+            f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {bit_index} "
+            f"ON notes USING hnsw ((binary_quantize({SHADOW_COLUMN})::bit({int(migration.dimensions)})) "
+            f"bit_hamming_ops)"
+        ))
+
+    # CONCURRENTLY statements cannot run inside a transaction block
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        for index_name, statement in statements:
+            # A build interrupted earlier leaves an invalid index behind
+            if _index_is_valid(conn, index_name) is False:
+                conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {index_name}"))
+
+            conn.execute(text(statement))
+
+    migration.status = "ready"
+    db.commit()
+
+
+def switch(db: Session, migration: EmbeddingMigration, batch_size: int = REEMBED_BATCH_SIZE):
+    # Lock order matters: first wait out in-flight embedding writers (they
+    # hold the active row FOR SHARE), then stop new note/chunk writes
+    db.execute(text(
+        "SELECT id FROM embedding_migrations WHERE status = 'active' FOR UPDATE"
+    ))
+    db.execute(text("LOCK TABLE notes, note_chunks IN SHARE ROW EXCLUSIVE MODE"))
+
+    # Whatever changed since the last catch-up pass; few rows by now
+    run_pass(db, migration, pending_only=True, batch_size=batch_size, commit=False)
+
+    indexes = list(EMBEDDING_TABLES.items())
+
+    if NOTE_RETRIEVAL == "binary":
+        indexes.append(("notes", NOTES_BIT_INDEX))
+
+    for table in EMBEDDING_TABLES:
+        db.execute(text(f"ALTER TABLE {table} DROP COLUMN IF EXISTS {PREVIOUS_COLUMN}"))
+        db.execute(text(f"ALTER TABLE {table} RENAME COLUMN embedding TO {PREVIOUS_COLUMN}"))
+        db.execute(text(f"ALTER TABLE {table} ALTER COLUMN {PREVIOUS_COLUMN} DROP NOT NULL"))
+        db.execute(text(f"ALTER TABLE {table} RENAME COLUMN {SHADOW_COLUMN} TO embedding"))
+
+    for _, index_name in indexes:
+        db.execute(text(
+            f"ALTER INDEX IF EXISTS {index_name} RENAME TO {_index_for(index_name, PREVIOUS_COLUMN)}"
+        ))
+        db.execute(text(
+            f"ALTER INDEX IF EXISTS {_index_for(index_name, SHADOW_COLUMN)} RENAME TO {index_name}"
+        ))
+
+    db.execute(text(
+        "UPDATE embedding_migrations SET status = 'retired', updated_at = now() "
+        "WHERE status = 'active'"
+    ))
+
+    migration.status = "active"
+    migration.switched_at = func.now()
+
+    # Raw DDL: the ORM hooks don't see it
+    bump_corpus_version(db)
+
+    # Columns, indexes, the active model and the corpus version change in
+    # one commit
+    db.commit()
+
+    invalidate_active_model()
+
+
+def abort(db: Session, migration: EmbeddingMigration):
+    for table in EMBEDDING_TABLES:
+        db.execute(text(f"ALTER TABLE {table} DROP COLUMN IF EXISTS {SHADOW_COLUMN}"))
+
+    migration.status = "aborted"
+    db.commit()
+
+
+def drop_previous(db: Session):
+    # The replaced vectors are kept for a manual rollback until this runs
+    for table in EMBEDDING_TABLES:
+        db.execute(text(f"ALTER TABLE {table} DROP COLUMN IF EXISTS {PREVIOUS_COLUMN}"))
+
+    db.commit()
@@ -0,0 +1,540 @@
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from sqlalchemy import insert, text
+from sqlalchemy.orm import Session
+
+from app.core.config import (
+    NOTE_TEXT_MAX_CHARS,
+    CHUNK_TEXT_MAX_CHARS,
+    CHUNK_WINDOW_WORDS,
+    CHUNK_OVERLAP_WORDS,
+    EMBEDDING_BATCH_MAX_SIZE,
+    INGESTION_WORKER_THREADS,
+    INGESTION_EXTRACT_PROCESSES,
+    INGESTION_BATCH_SIZE,
+    INGESTION_POLL_INTERVAL_SECONDS,
+    INGESTION_LEASE_SECONDS,
+    INGESTION_MAX_ATTEMPTS
+)
+from app.db.session import SessionLocal
+from app.ml.embedding_model import generate_embeddings
+from app.models.ingestion_job import IngestionJob
+from app.models.note import Note
+from app.models.note_chunk import NoteChunk
+from app.services import search_cache  # noqa: F401  (corpus version hooks)
+from app.services.active_model import lock_active_model, read_active_model
+from app.services.blob_store import release_blob
+from app.utils.pdf_utils import extract_pdf
+from app.utils.text_chunker import chunk_text
+
+
+logger = logging.getLogger(__name__)
+
+
+def enqueue_note(db: Session, note: Note) -> IngestionJob:
+    job = IngestionJob(note_id=note.id, status="pending")
+    db.add(job)
+    return job
+
+
+def claim_jobs(db: Session, limit: int):
+    # SKIP LOCKED lets any number of workers poll the same table without
+    # blocking on each other; jobs whose lease expired (crashed worker)
+    # are picked up again.
+    rows = db.execute(
+        text("""
+            UPDATE ingestion_jobs
+            SET
+                status = 'running',
+                attempts = attempts + 1,
+                locked_at = now(),
+                updated_at = now()
+            WHERE id IN (
+                SELECT id
+                FROM ingestion_jobs
+                WHERE status = 'pending'
+                   OR (
+                        status = 'running'
+                        AND locked_at < now() - make_interval(secs => :lease)
+                   )
+                ORDER BY created_at
+                LIMIT :limit
+                FOR UPDATE SKIP LOCKED
+            )
+            RETURNING id, note_id, attempts
+        """),
+        {
+            "lease": INGESTION_LEASE_SECONDS,
+            "limit": limit
+        }
+    ).fetchall()
+
+    db.commit()
+
+    return rows
+
+
+def encode_texts(texts, model_name: str = None):
+    # Submit in model-sized slices so search queries sharing the batcher
+    # are served between slices instead of behind a whole ingest batch
+    vectors = []
+
+    for start in range(0, len(texts), EMBEDDING_BATCH_MAX_SIZE):
+        vectors.extend(generate_embeddings(
+            texts[start:start + EMBEDDING_BATCH_MAX_SIZE],
+            model_name
+        ))
+
+    return vectors
+
+
+def note_embedding_text(title: str, description: str, note_text: str) -> str:
+    return title + " " + (description or "") + " " + note_text[:NOTE_TEXT_MAX_CHARS]
+
+
+def encode_note_texts(items, model_name: str = None):
+    # items: (title, description, extracted text). Encodes the note-level
+    # vectors and every passage chunk in one pass; returns per item its
+    # vector and its chunks as (content, vector) pairs.
+    note_texts = [
+        note_embedding_text(title, description, note_text)
+        for title, description, note_text in items
+    ]
+
+    chunks = [
+        chunk_text(note_text, CHUNK_WINDOW_WORDS, CHUNK_OVERLAP_WORDS)
+        for _, _, note_text in items
+    ]
+
+    vectors = encode_texts(
+        note_texts + [c for note_chunks in chunks for c in note_chunks],
+        model_name
+    )
+
+    chunk_vectors = iter(vectors[len(items):])
+
+    return [
+        (embedding, [(content, next(chunk_vectors)) for content in note_chunks])
+        for embedding, note_chunks in zip(vectors, chunks)
+    ]
+
+
+def chunk_rows(note_id, chunks):
+    return [
+        {
+            "note_id": note_id,
+            "chunk_index": i,
+            "content": content,
+            "embedding": embedding
+        }
+        for i, (content, embedding) in enumerate(chunks)
+    ]
+
+
+def encode_notes(items, model_name: str = None):
+    # items: (note, extracted text) pairs. Sets the notes' text and vector
+    # and returns the note_chunks rows.
+    encoded = encode_note_texts(
+        [(note.title, note.description, note_text) for note, note_text in items],
+        model_name
+    )
+
+    rows = []
+
+    for (note, note_text), (embedding, chunks) in zip(items, encoded):
+        note.extracted_text = note_text
+        note.embedding = embedding
+
+        rows.extend(chunk_rows(note.id, chunks))
+
+    return rows
+
+
+def replace_chunks(db: Session, note_ids, rows):
+    if not note_ids:
+        return
+
+    db.query(NoteChunk).filter(
+        NoteChunk.note_id.in_(note_ids)
+    ).delete(synchronize_session=False)
+
+    if rows:
+        db.execute(insert(NoteChunk), rows)
+
+
+# Passage chunks of a processed copy of the same file
+COPY_CHUNKS_SQL = text("""
+    INSERT INTO note_chunks (id, note_id, chunk_index, content, embedding)
+    SELECT gen_random_uuid(), :note_id, chunk_index, content, embedding
+    FROM note_chunks
+    WHERE note_id = :source_id
+""")
+
+
+def find_processed(db: Session, hashes):
+    # content hash -> a ready note (any owner) already holding that
+    # file's extracted text and vectors
+    if not hashes:
+        return {}
+
+    notes = db.query(Note).filter(
+        Note.content_hash.in_(list(hashes)),
+        Note.status == "ready",
+        Note.extracted_text.isnot(None)
+    ).distinct(Note.content_hash).order_by(Note.content_hash, Note.created_at)
+
+    return {note.content_hash: note for note in notes}
+
+
+def reuse_text(note: Note, source: Note):
+    # Note-level text to encode for a note titled / described differently
+    # from its source; None when the source's vector can be copied
+    if (note.title, note.description) == (source.title, source.description):
+        return None
+
+    return note_embedding_text(note.title, note.description, source.extracted_text)
+
+
+def encode_reused(texts, model_name: str = None):
+    # reuse_text results -> vectors, None where the source's is copied
+    vectors = iter(encode_texts([t for t in texts if t is not None], model_name))
+
+    return [None if t is None else next(vectors) for t in texts]
+
+
+def reuse_processed(db: Session, items, model_name: str = None, embeddings=None):
+    # items: (note, source) pairs, source from find_processed. Copies the
+    # text and passage chunks instead of extracting and encoding again;
+    # only the note-level vector of a note titled / described differently
+    # is encoded, unless encode_reused already did (embeddings). The notes
+    # must already be flushed.
+    if not items:
+        return
+
+    if embeddings is None:
+        embeddings = encode_reused(
+            [reuse_text(note, source) for note, source in items],
+            model_name
+        )
+
+    for (note, source), embedding in zip(items, embeddings):
+        note.extracted_text = source.extracted_text
+        note.page_count = source.page_count
+        note.embedding = source.embedding if embedding is None else embedding
+
+    db.query(NoteChunk).filter(
+        NoteChunk.note_id.in_([note.id for note, _ in items])
+    ).delete(synchronize_session=False)
+
+    db.execute(
+        COPY_CHUNKS_SQL,
+        [{"note_id": note.id, "source_id": source.id} for note, source in items]
+    )
+
+
+def _fail(db: Session, job: IngestionJob, note: Note, error: str):
+    job.status = "failed"
+    job.error = error
+
+    # Notes that are already searchable (re-processing) keep their state
+    if note is not None and note.status == "processing":
+        note.status = "failed"
+        note.processing_error = error
+
+        # The file goes when the batch commits; view and download
+        # answer 410 for failed notes
+        release_blob(db, note.content_hash, note.file_path)
+
+
+def process_jobs(db: Session, claimed, executor: ProcessPoolExecutor):
+    # Reads the batch, then extracts and encodes it with no transaction
+    # open, so neither the model row lock nor a snapshot is held through
+    # the slow part. The results are written in one short transaction.
+    model_name = read_active_model(db)
+
+    job_ids = [row.id for row in claimed]
+
+    jobs = db.query(IngestionJob).filter(IngestionJob.id.in_(job_ids)).all()
+
+    notes = {
+        note.id: note
+        for note in db.query(Note).filter(
+            Note.id.in_([job.note_id for job in jobs])
+        )
+    }
+
+    # Files already processed for another note (same content hash) are
+    # copied from it; the rest are extracted in parallel across processes
+    sources = find_processed(db, {
+        note.content_hash for note in notes.values() if note.content_hash
+    })
+
+    failed = {}
+    pending = []
+    reused = {}
+
+    for job in jobs:
+        note = notes.get(job.note_id)
+
+        if note is None:
+            continue
+
+        if job.attempts > INGESTION_MAX_ATTEMPTS:
+            failed[job.id] = "Too many failed processing attempts"
+            continue
+
+        source = sources.get(note.content_hash)
+
+        # A ready note being re-processed may be its own source
+        if source is not None and source.id != note.id:
+            reused[job.id] = (source.id, reuse_text(note, source))
+            continue
+
+        pending.append((
+            job.id,
+            note.title,
+            note.description,
+            executor.submit(
+                extract_pdf,
+                note.file_path,
+                max(NOTE_TEXT_MAX_CHARS, CHUNK_TEXT_MAX_CHARS)
+            )
+        ))
+
+    # Ends the read transaction; only the values taken above are used
+    # until the write
+    db.commit()
+
+    extracted = {}
+
+    for job_id, title, description, future in pending:
+        try:
+            pdf = future.result()
+        except Exception:
+            failed[job_id] = "Failed to extract PDF text"
+            continue
+
+        if not pdf.text.strip():
+            failed[job_id] = "PDF contains no readable text"
+            continue
+
+        extracted[job_id] = (title, description, pdf)
+
+    # Encode the whole batch (notes and their chunks) together
+    encoded = dict(zip(extracted, encode_note_texts(
+        [(title, description, pdf.text) for title, description, pdf in extracted.values()],
+        model_name
+    )))
+
+    reused_embeddings = dict(zip(reused, encode_reused(
+        [text for _, text in reused.values()],
+        model_name
+    )))
+
+    _write_batch(db, job_ids, model_name, failed, extracted, encoded, reused, reused_embeddings)
+
+
+def _write_batch(db: Session, job_ids, model_name, failed, extracted, encoded, reused, reused_embeddings):
+
+    # Before any write, so an embedding model switch can't interleave
+    locked_model = lock_active_model(db)
+
+    if locked_model != model_name:
+        # A switch committed while the batch was being encoded; vectors
+        # from the old model must not be written. Rare enough to encode
+        # again under the lock.
+        model_name = locked_model
+
+        encoded = dict(zip(extracted, encode_note_texts(
+            [(title, description, pdf.text) for title, description, pdf in extracted.values()],
+            model_name
+        )))
+
+        # reuse_processed encodes these with the new model
+        reused_embeddings = None
+
+    jobs = db.query(IngestionJob).filter(IngestionJob.id.in_(job_ids)).all()
+
+    notes = {
+        note.id: note
+        for note in db.query(Note).filter(
+            Note.id.in_([job.note_id for job in jobs])
+        )
+    }
+
+    sources = {
+        note.id: note
+        for note in db.query(Note).filter(
+            Note.id.in_([source_id for source_id, _ in reused.values()]),
+            Note.status == "ready",
+            Note.extracted_text.isnot(None)
+        )
+    }
+
+    done = []
+    rows = []
+    reuse_items = []
+
+    for job in jobs:
+        note = notes.get(job.note_id)
+
+        if note is None:
+            job.status = "done"
+            continue
+
+        if job.id in failed:
+            _fail(db, job, note, failed[job.id])
+
+        elif job.id in encoded:
+            _, _, pdf = extracted[job.id]
+            embedding, chunks = encoded[job.id]
+
+            note.extracted_text = pdf.text
+            note.page_count = pdf.page_count
+            note.embedding = embedding
+
+            rows.extend(chunk_rows(note.id, chunks))
+            done.append((job, note))
+
+        elif job.id in reused:
+            source = sources.get(reused[job.id][0])
+
+            # Gone since the read: extract the file on the next attempt
+            if source is None:
+                job.status = "pending"
+                continue
+
+            reuse_items.append((note, source))
+            done.append((job, note))
+
+    replace_chunks(db, [note.id for job, note in done if job.id in encoded], rows)
+
+    reuse_processed(
+        db,
+        reuse_items,
+        model_name,
+        None if reused_embeddings is None else [
+            reused_embeddings[job.id] for job, _ in done if job.id in reused
+        ]
+    )
+
+    for job, note in done:
+        note.status = "ready"
+        note.processing_error = None
+
+        job.status = "done"
+        job.error = None
+
+    db.commit()
+
+
+def release_jobs(db: Session, claimed):
+    # Hand jobs back to the queue after an unexpected (e.g. model) error
+    db.query(IngestionJob).filter(
+        IngestionJob.id.in_([row.id for row in claimed]),
+        IngestionJob.status == "running"
+    ).update({"status": "pending"}, synchronize_session=False)
+
+    db.commit()
+
+
+class IngestionWorker:
+
+    def __init__(
+        self,
+        threads: int = INGESTION_WORKER_THREADS,
+        processes: int = INGESTION_EXTRACT_PROCESSES,
+        batch_size: int = INGESTION_BATCH_SIZE,
+        poll_interval: float = INGESTION_POLL_INTERVAL_SECONDS
+    ):
+        self.threads = threads
+        self.processes = processes
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+
+        self._stop = threading.Event()
+        self._threads = []
+        self._executor = None
+
+    def start(self):
+        # spawn, not fork: the parent already holds torch threads and DB sockets
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.processes,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+
+        for i in range(self.threads):
+            thread = threading.Thread(
+                target=self._run,
+                name=f"ingestion-worker-{i}",
+                daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self):
+        self._stop.set()
+
+        for thread in self._threads:
+            thread.join()
+
+        self._threads = []
+
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def run_once(self) -> int:
+        db = SessionLocal()
+        claimed = []
+
+        try:
+            claimed = claim_jobs(db, self.batch_size)
+
+            if claimed:
+                process_jobs(db, claimed, self._executor)
+
+        except Exception:
+            logger.exception("Ingestion batch failed")
+            db.rollback()
+
+            if claimed:
+                try:
+                    release_jobs(db, claimed)
+                except Exception:
+                    # Lease expiry will hand them back instead
+                    logger.exception("Failed to release ingestion jobs")
+
+        finally:
+            db.close()
+
+        return len(claimed)
+
+    def _run(self):
+        while not self._stop.is_set():
+            if not self.run_once():
+                self._stop.wait(self.poll_interval)
+
+
+ingestion_worker = None
+
+
+def start_ingestion_worker():
+    global ingestion_worker
+
+    if ingestion_worker is None:
+        ingestion_worker = IngestionWorker()
+        ingestion_worker.start()
+
+    return ingestion_worker
+
+
+def stop_ingestion_worker():
+    global ingestion_worker
+
+    if ingestion_worker is not None:
+        ingestion_worker.stop()
+        ingestion_worker = None
@@ -0,0 +1,139 @@
+import logging
+import threading
+from collections import defaultdict
+
+from sqlalchemy import text
+
+from app.core.config import COUNTER_FLUSH_INTERVAL_SECONDS, COUNTER_FLUSH_BATCH_SIZE
+from app.db.session import SessionLocal
+
+
+logger = logging.getLogger(__name__)
+
+COUNTER_FIELDS = ("view_count", "download_count", "upvotes")
+
+
+class CounterBuffer:
+    """Per-process buffer of note counter increments, flushed to the
+    database in batched UPDATEs."""
+
+    def __init__(
+        self,
+        flush_interval: float = COUNTER_FLUSH_INTERVAL_SECONDS,
+        batch_size: int = COUNTER_FLUSH_BATCH_SIZE
+    ):
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+
+        self._pending = defaultdict(lambda: dict.fromkeys(COUNTER_FIELDS, 0))
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def increment(self, note_id, field: str, amount: int = 1):
+        if field not in COUNTER_FIELDS:
+            raise ValueError(f"Unknown counter: {field}")
+
+        with self._lock:
+            self._pending[str(note_id)][field] += amount
+
+    def pending(self, note_id, field: str) -> int:
+        with self._lock:
+            deltas = self._pending.get(str(note_id))
+            return deltas[field] if deltas else 0
+
+    def flush(self) -> int:
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, defaultdict(
+                    lambda: dict.fromkeys(COUNTER_FIELDS, 0)
+                )
+
+            if not pending:
+                return 0
+
+            items = list(pending.items())
+
+            try:
+                self._write(items)
+            except Exception:
+                logger.exception("Counter flush failed, keeping deltas for retry")
+                self._restore(items)
+                return 0
+
+            return len(items)
+
+    def _write(self, items):
+        db = SessionLocal()
+
+        try:
+            for start in range(0, len(items), self.batch_size):
+                batch = items[start:start + self.batch_size]
+
+                values = []
+                params = {}
+
+                for i, (note_id, deltas) in enumerate(batch):
+                    values.append(f"(CAST(:id{i} AS uuid), :v{i}, :d{i}, :u{i})")
+                    params[f"id{i}"] = note_id
+                    params[f"v{i}"] = deltas["view_count"]
+                    params[f"d{i}"] = deltas["download_count"]
+                    params[f"u{i}"] = deltas["upvotes"]
+
+                db.execute(
+                    text(f"""
+                        UPDATE notes
+                        SET
+                            view_count = notes.view_count + v.views,
+                            download_count = notes.download_count + v.downloads,
+                            upvotes = notes.upvotes + v.upvotes
+                        FROM (VALUES {", ".join(values)})
+                            AS v(id, views, downloads, upvotes)
+                        WHERE notes.id = v.id
+                    """),
+                    params
+                )
+
+            db.commit()
+
+        except Exception:
+            db.rollback()
+            raise
+
+        finally:
+            db.close()
+
+    def _restore(self, items):
+        with self._lock:
+            for note_id, deltas in items:
+                for field, amount in deltas.items():
+                    self._pending[note_id][field] += amount
+
+    def start(self):
+        if self._thread is not None:
+            return
+
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run,
+            name="note-counter-flush",
+            daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+        self.flush()
+
+    def _run(self):
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
+
+
+note_counters = CounterBuffer()
@@ -0,0 +1,332 @@
+import asyncio
+from datetime import datetime
+from functools import lru_cache
+from typing import NamedTuple, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import (
+    EMBEDDING_MODEL_NAME,
+    HNSW_EF_SEARCH,
+    PASSAGE_CHUNK_LIMIT,
+    PASSAGE_AGGREGATION,
+    PASSAGE_TOP_K,
+    NOTE_RETRIEVAL,
+    BINARY_OVERSAMPLE
+)
+from app.ml.note_index import note_index
+from app.services.active_model import ACTIVE_MODEL_GUARD
+
+
+SIMILARITY_THRESHOLD = 0.40
+CANDIDATE_LIMIT = 100
+# pgvector's upper bound for hnsw.ef_search
+HNSW_MAX_EF_SEARCH = 1000
+
+SEARCH_MODES = ("note", "passage")
+
+
+class SearchFilters(NamedTuple):
+    subject: Optional[str] = None
+    author_id: Optional[int] = None
+    created_after: Optional[datetime] = None
+    # Also match this user's private notes
+    owner_id: Optional[int] = None
+
+    @property
+    def active(self) -> bool:
+        return any(value is not None for value in self)
+
+
+NO_FILTERS = SearchFilters()
+
+
+def _filter_sql(filters: SearchFilters, prefix: str = "") -> str:
+    # Applied inside the vector scan (not to its output), so with
+    # hnsw.iterative_scan a selective filter still yields a full LIMIT
+    clauses = [f"{prefix}status = 'ready'", ACTIVE_MODEL_GUARD]
+
+    if filters.owner_id is not None:
+        clauses.append(f"({prefix}is_private = false OR {prefix}user_id = :owner_id)")
+    else:
+        clauses.append(f"{prefix}is_private = false")
+
+    if filters.subject is not None:
+        clauses.append(f"{prefix}subject = :subject")
+
+    if filters.author_id is not None:
+        clauses.append(f"{prefix}user_id = :author_id")
+
+    if filters.created_after is not None:
+        clauses.append(f"{prefix}created_at > :created_after")
+
+    return "\n      AND ".join(clauses)
+
+
+def _filter_params(filters: SearchFilters):
+    return {
+        name: value
+        for name, value in filters._asdict().items()
+        if value is not None
+    }
+
+
+@lru_cache(maxsize=64)
+def _statement(template: str, filters: str, dim: int):
+    # Dimension comes from the query vector, so statements keep working
+    # across a switch to a model of another size. :embedding is left
+    # untyped: the server infers vector and the asyncpg codec registered
+    # on the async engine encodes the list in binary.
+    return text(template.format(filters=filters, dim=dim))
+
+
+def _search_sql(template: str, filters: SearchFilters, query_embedding, prefix: str = ""):
+    return _statement(template, _filter_sql(filters, prefix), len(query_embedding))
+
+
+NOTE_SEARCH_SQL = """
+    SELECT
+        id,
+        title,
+        subject,
+        description,
+        user_id,
+        created_at,
+        upvotes,
+        view_count,
+        download_count,
+        embedding <=> :embedding AS distance,
+        1 - (embedding <=> :embedding) AS similarity
+    FROM notes
+    WHERE {filters}
+    ORDER BY embedding <=> :embedding
+    LIMIT :limit
+"""
+
+
+# Coarse pass: Hamming distance over 1-bit-per-dimension codes (served by
+# the ix_notes_embedding_bit_hnsw expression index); the wider candidate
+# set is then re-ranked with exact cosine distance.
+BINARY_NOTE_SEARCH_SQL = """
+    SELECT
+        id,
+        title,
+        subject,
+        description,
+        user_id,
+        created_at,
+        upvotes,
+        view_count,
+        download_count,
+        embedding <=> :embedding AS distance,
+        1 - (embedding <=> :embedding) AS similarity
+    FROM (
+        SELECT
+            id,
+            title,
+            subject,
+            description,
+            user_id,
+            created_at,
+            upvotes,
+            view_count,
+            download_count,
+            embedding
+        FROM notes
+        WHERE {filters}
+        ORDER BY binary_quantize(embedding)::bit({dim}) <~> binary_quantize(CAST(:embedding AS vector))
+        LIMIT :candidates
+    ) coarse
+    ORDER BY embedding <=> :embedding
+    LIMIT :limit
+"""
+
+
+# Nearest chunks come from the note_chunks HNSW index; each note is then
+# scored by the mean distance of its best :top_k chunks (top_k = 1 is max-sim).
+# Chunks of notes the filters exclude are skipped during the scan.
+PASSAGE_SEARCH_SQL = """
+    WITH top_chunks AS (
+        SELECT
+            c.note_id,
+            c.embedding <=> :embedding AS distance
+        FROM note_chunks c
+        JOIN notes n ON n.id = c.note_id
+        WHERE {filters}
+        ORDER BY c.embedding <=> :embedding
+        LIMIT :chunk_limit
+    ),
+    ranked AS (
+        SELECT
+            note_id,
+            distance,
+            ROW_NUMBER() OVER (PARTITION BY note_id ORDER BY distance) AS rank
+        FROM top_chunks
+    ),
+    scored AS (
+        SELECT note_id, AVG(distance) AS distance
+        FROM ranked
+        WHERE rank <= :top_k
+        GROUP BY note_id
+    )
+    SELECT
+        n.id,
+        n.title,
+        n.subject,
+        n.description,
+        n.user_id,
+        n.created_at,
+        n.upvotes,
+        n.view_count,
+        n.download_count,
+        s.distance,
+        1 - s.distance AS similarity
+    FROM scored s
+    JOIN notes n ON n.id = s.note_id
+    ORDER BY s.distance
+    LIMIT :limit
+"""
+
+
+# Metadata for ids ranked by the in-process note index; visibility is
+# re-checked here, so a stale mirror entry can never leak a private note.
+HYDRATE_NOTES_SQL = text("""
+    SELECT
+        id,
+        title,
+        subject,
+        description,
+        user_id,
+        created_at,
+        upvotes,
+        view_count,
+        download_count
+    FROM notes
+    WHERE id = ANY(CAST(:ids AS uuid[]))
+      AND is_private = false
+      AND status = 'ready'
+""")
+
+
+def _candidate(row, similarity: float, distance: float):
+    return {
+        "id": str(row.id),
+        "title": row.title,
+        "subject": row.subject,
+        "description": row.description,
+        "author_id": str(row.user_id),
+        "created_at": row.created_at,
+        "similarity": similarity,
+        "distance": distance,
+        "upvotes": row.upvotes,
+        "views": row.view_count,
+        "downloads": row.download_count
+    }
+
+
+def _to_candidates(rows):
+    candidates = []
+
+    for row in rows:
+
+        similarity = float(row.similarity)
+
+        if similarity < SIMILARITY_THRESHOLD:
+            continue
+
+        candidates.append(_candidate(row, similarity, float(row.distance)))
+
+    return candidates
+
+
+async def _search_note_index(db: AsyncSession, query_embedding):
+    # The scan is a matrix-vector product over the whole index, under
+    # its lock: off the event loop
+    matches = await asyncio.to_thread(note_index.index.search, query_embedding, CANDIDATE_LIMIT)
+
+    hits = [
+        (note_id, similarity)
+        for note_id, similarity in matches
+        if similarity >= SIMILARITY_THRESHOLD
+    ]
+
+    if not hits:
+        return []
+
+    rows = {
+        str(row.id): row
+        for row in await db.execute(HYDRATE_NOTES_SQL, {"ids": [note_id for note_id, _ in hits]})
+    }
+
+    return [
+        _candidate(rows[note_id], similarity, 1 - similarity)
+        for note_id, similarity in hits
+        if note_id in rows
+    ]
+
+
+async def search_notes(
+    db: AsyncSession,
+    query_embedding,
+    mode: str = "note",
+    filters: SearchFilters = NO_FILTERS,
+    model_name: str = EMBEDDING_MODEL_NAME
+):
+
+    # The in-process mirror holds vectors only (loaded from the configured
+    # model's column); filtered searches go to SQL
+    if (
+        mode == "note"
+        and not filters.active
+        and model_name == EMBEDDING_MODEL_NAME
+        and note_index is not None
+        and note_index.available
+    ):
+        return await _search_note_index(db, query_embedding)
+
+    params = {**_filter_params(filters), "model_name": model_name}
+
+    if mode == "passage":
+        result = await db.execute(
+            _search_sql(PASSAGE_SEARCH_SQL, filters, query_embedding, "n."),
+            {
+                **params,
+                "embedding": query_embedding,
+                "chunk_limit": PASSAGE_CHUNK_LIMIT,
+                "top_k": 1 if PASSAGE_AGGREGATION == "max" else PASSAGE_TOP_K,
+                "limit": CANDIDATE_LIMIT
+            }
+        )
+
+    elif NOTE_RETRIEVAL == "binary":
+        candidates = min(CANDIDATE_LIMIT * BINARY_OVERSAMPLE, HNSW_MAX_EF_SEARCH)
+
+        # An HNSW scan yields at most ef_search rows
+        if candidates > HNSW_EF_SEARCH:
+            await db.execute(
+                text("SELECT set_config('hnsw.ef_search', :ef, true)"),
+                {"ef": str(candidates)}
+            )
+
+        result = await db.execute(
+            _search_sql(BINARY_NOTE_SEARCH_SQL, filters, query_embedding),
+            {
+                **params,
+                "embedding": query_embedding,
+                "candidates": candidates,
+                "limit": CANDIDATE_LIMIT
+            }
+        )
+
+    else:
+        result = await db.execute(
+            _search_sql(NOTE_SEARCH_SQL, filters, query_embedding),
+            {
+                **params,
+                "embedding": query_embedding,
+                "limit": CANDIDATE_LIMIT
+            }
+        )
+
+    return _to_candidates(result.fetchall())
@@ -0,0 +1,73 @@
+import asyncio
+import logging
+import threading
+
+from app.db.session import prime_async_pool, prime_pool
+from app.ml.embedding_model import provider
+
+
+logger = logging.getLogger(__name__)
+
+
+class Readiness:
+    """Warms a worker up in the background after startup: primes both DB
+    pools, then loads the embedding model and runs one encode. Liveness
+    doesn't wait for this; readiness does."""
+
+    def __init__(self):
+        self.db_ready = False
+        self.db_error = None
+        self.async_db_ready = False
+        self.async_db_error = None
+
+        self._thread = None
+        self._async_task = None
+
+    def _run(self):
+        try:
+            prime_pool()
+            self.db_ready = True
+        except Exception as e:
+            self.db_error = str(e)
+            logger.exception("Priming the database pool failed")
+
+        provider.warm_up()
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="readiness", daemon=True)
+            self._thread.start()
+
+    async def _run_async(self):
+        try:
+            await prime_async_pool()
+            self.async_db_ready = True
+        except Exception as e:
+            self.async_db_error = str(e)
+            logger.exception("Priming the async database pool failed")
+
+    def start_async(self):
+        # On the app's event loop, which the async pool's connections
+        # are bound to
+        if self._async_task is None:
+            self._async_task = asyncio.get_running_loop().create_task(self._run_async())
+
+    @property
+    def ready(self) -> bool:
+        return self.db_ready and self.async_db_ready and provider.warm
+
+    def status(self):
+        return {
+            "status": "ready" if self.ready else "starting",
+            "database": "ready" if self.db_ready else (self.db_error or "starting"),
+            "async_database": (
+                "ready" if self.async_db_ready else (self.async_db_error or "starting")
+            ),
+            "embedding_model": (
+                "ready" if provider.warm
+                else provider.error or ("warming up" if provider.loaded else "loading")
+            )
+        }
+
+
+readiness = Readiness()
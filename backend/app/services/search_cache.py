@@ -0,0 +1,234 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+
+from sqlalchemy import event, inspect, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import (
+    SEARCH_CACHE_ENABLED,
+    SEARCH_CACHE_PATH,
+    SEARCH_CACHE_MAX_BYTES,
+    SEARCH_CACHE_TTL_SECONDS
+)
+from app.models.note import Note
+
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS results (
+        key TEXT PRIMARY KEY,
+        corpus_version INTEGER NOT NULL,
+        payload TEXT NOT NULL,
+        size INTEGER NOT NULL,
+        created_at REAL NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS ix_results_created_at ON results (created_at);
+"""
+
+
+def _json_default(value):
+    # datetimes; FastAPI would render them as ISO strings anyway
+    return value.isoformat()
+
+
+# The corpus version lives in Postgres, so a change committed by any
+# process on any host (ingestion workers, the model switch) invalidates
+# every host's cache at once
+CORPUS_VERSION_SQL = text("SELECT version FROM search_corpus WHERE id = 1")
+
+BUMP_CORPUS_VERSION_SQL = text("""
+    INSERT INTO search_corpus (id, version)
+    VALUES (1, 1)
+    ON CONFLICT (id) DO UPDATE
+    SET version = search_corpus.version + 1
+""")
+
+
+async def read_corpus_version(db: AsyncSession) -> int:
+    return (await db.execute(CORPUS_VERSION_SQL)).scalar() or 0
+
+
+def bump_corpus_version(db: Session):
+    # In the caller's transaction: the row stays locked until it commits,
+    # so concurrent writers of searchable notes queue on it briefly
+    db.execute(BUMP_CORPUS_VERSION_SQL)
+
+
+class SearchResultCache:
+    """Search results keyed by (query, options), valid only for the corpus
+    version they were computed at (read from Postgres per request). Stored
+    in SQLite so every worker on the host shares entries."""
+
+    def __init__(self, path: str, max_bytes: int, ttl: float):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(SCHEMA)
+            self._local.conn = conn
+
+        return conn
+
+    @staticmethod
+    def make_key(*parts) -> str:
+        raw = json.dumps(parts, sort_keys=True, default=str)
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def get(self, key: str, corpus_version: int):
+        row = self._conn().execute(
+            """
+            SELECT payload
+            FROM results
+            WHERE key = ?
+              AND corpus_version = ?
+              AND created_at > ?
+            """,
+            (key, corpus_version, time.time() - self.ttl)
+        ).fetchone()
+
+        with self._lock:
+            if row is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+
+        return None if row is None else json.loads(row[0])
+
+    def set(self, key: str, value, corpus_version: int):
+        payload = json.dumps(value, default=_json_default)
+        size = len(payload)
+
+        if size > self.max_bytes:
+            return
+
+        conn = self._conn()
+
+        conn.execute("BEGIN IMMEDIATE")
+
+        try:
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO results (key, corpus_version, payload, size, created_at)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                (key, corpus_version, payload, size, time.time())
+            )
+            self._evict(conn, corpus_version)
+            conn.execute("COMMIT")
+
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _evict(self, conn, corpus_version: int):
+        # Entries from older corpus versions or past the TTL can never hit
+        conn.execute(
+            """
+            DELETE FROM results
+            WHERE corpus_version < ?
+               OR created_at <= ?
+            """,
+            (corpus_version, time.time() - self.ttl)
+        )
+
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+
+        if total <= self.max_bytes:
+            return
+
+        # Drop oldest entries until back under the byte budget
+        for key, size in conn.execute(
+            "SELECT key, size FROM results ORDER BY created_at"
+        ).fetchall():
+            conn.execute("DELETE FROM results WHERE key = ?", (key,))
+            total -= size
+
+            if total <= self.max_bytes:
+                break
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+
+            stats = {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0
+            }
+
+        entries, size = self._conn().execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results"
+        ).fetchone()
+
+        stats.update({
+            "entries": entries,
+            "bytes": size,
+            "max_bytes": self.max_bytes
+        })
+
+        return stats
+
+
+search_cache = SearchResultCache(
+    SEARCH_CACHE_PATH,
+    SEARCH_CACHE_MAX_BYTES,
+    SEARCH_CACHE_TTL_SECONDS
+) if SEARCH_CACHE_ENABLED else None
+
+
+def _is_searchable(note: Note, committed: bool = False) -> bool:
+    # Value before this flush when committed=True
+    state = inspect(note)
+
+    def value(attr):
+        if not committed:
+            return getattr(note, attr)
+
+        history = state.attrs[attr].history
+        return history.deleted[0] if history.deleted else getattr(note, attr)
+
+    return value("is_private") is False and value("status") == "ready"
+
+
+@event.listens_for(Session, "after_flush")
+def _track_corpus_changes(session, flush_context):
+    # A note entering or leaving the public, searchable set changes
+    # the corpus; plain counter or metadata edits do not.
+    changed = any(
+        isinstance(obj, Note) and _is_searchable(obj)
+        for obj in session.new
+    ) or any(
+        isinstance(obj, Note) and _is_searchable(obj, committed=True)
+        for obj in session.deleted
+    ) or any(
+        isinstance(obj, Note)
+        and _is_searchable(obj) != _is_searchable(obj, committed=True)
+        for obj in session.dirty
+    )
+
+    # Once per transaction, committed or rolled back along with the notes
+    if changed and not session.info.get("corpus_bumped"):
+        bump_corpus_version(session)
+        session.info["corpus_bumped"] = True
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _reset_corpus_bump(session, transaction):
+    if transaction.parent is None:
+        session.info.pop("corpus_bumped", None)
@@ -1,10 +1,38 @@
+from typing import Iterator, NamedTuple, Optional
+
 import fitz  # PyMuPDF
 
-def extract_text_from_pdf(file_path: str) -> str:
-    text = ""
-    doc = fitz.open(file_path)
 
+class PdfText(NamedTuple):
+    text: str
+    page_count: int
+
+
+def iter_page_text(doc) -> Iterator[str]:
+    # Pages are parsed lazily, so callers that stop early never touch the rest
     for page in doc:
-        text += page.get_text()
+        yield page.get_text()
+
+
+def extract_pdf(file_path: str, max_chars: Optional[int] = None) -> PdfText:
+    parts = []
+    total = 0
+
+    with fitz.open(file_path) as doc:
+        page_count = doc.page_count
+
+        for page_text in iter_page_text(doc):
+            if max_chars is not None:
+                page_text = page_text[:max_chars - total]
+
+            parts.append(page_text)
+            total += len(page_text)
+
+            if max_chars is not None and total >= max_chars:
+                break
+
+    return PdfText("".join(parts), page_count)
+
 
-    return text
+def extract_text_from_pdf(file_path: str, max_chars: Optional[int] = None) -> str:
+    return extract_pdf(file_path, max_chars).text
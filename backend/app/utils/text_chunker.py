@@ -0,0 +1,21 @@
+from typing import List
+
+
+def chunk_text(text: str, window: int, overlap: int) -> List[str]:
+    # Fixed-size windows of whitespace tokens; consecutive windows share
+    # `overlap` tokens so a passage split at a boundary is still seen whole.
+    words = text.split()
+
+    if not words:
+        return []
+
+    step = max(1, window - overlap)
+    chunks = []
+
+    for start in range(0, len(words), step):
+        chunks.append(" ".join(words[start:start + window]))
+
+        if start + window >= len(words):
+            break
+
+    return chunks
@@ -0,0 +1,113 @@
+"""Recall and latency of binary-quantized search with exact re-ranking.
+
+Builds a clustered synthetic corpus of unit vectors (embedding-like:
+topics are clusters, notes are noisy points around them), then compares
+exact cosine top-k against Hamming top-(k * oversample) over sign bits
+(what pgvector's binary_quantize computes) followed by an exact re-rank.
+
+Usage (from backend/):
+    python -m benchmarks.bench_binary_quantization --notes 50000 --k 100
+"""
+import argparse
+import time
+
+import numpy as np
+
+
+DIM = 384
+
+# popcount for every byte value (fallback for numpy < 2.0)
+POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint16)
+
+
+def hamming(codes, query_code):
+    # 384 bits = six 64-bit words per vector
+    xor = np.bitwise_xor(codes, query_code)
+
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(xor.view(np.uint64)).sum(axis=1, dtype=np.uint16)
+
+    return POPCOUNT[xor].sum(axis=1)
+
+
+def make_corpus(rng, notes: int, topics: int, noise: float):
+    centers = rng.standard_normal((topics, DIM)).astype(np.float32)
+    assignment = rng.integers(0, topics, size=notes)
+
+    corpus = centers[assignment] + noise * rng.standard_normal((notes, DIM)).astype(np.float32)
+    corpus /= np.linalg.norm(corpus, axis=1, keepdims=True)
+
+    return corpus, centers
+
+
+def make_queries(rng, centers, count: int, noise: float):
+    picks = centers[rng.integers(0, len(centers), size=count)]
+    queries = picks + noise * rng.standard_normal(picks.shape).astype(np.float32)
+    return queries / np.linalg.norm(queries, axis=1, keepdims=True)
+
+
+def exact_top_k(corpus, query, k: int):
+    scores = corpus @ query
+    top = np.argpartition(-scores, k)[:k]
+    return top[np.argsort(-scores[top])]
+
+
+def binary_top_k(corpus, codes, query, k: int, oversample: int):
+    query_code = np.packbits(query > 0)
+
+    distances = hamming(codes, query_code)
+
+    candidates = min(k * oversample, len(corpus) - 1)
+    coarse = np.argpartition(distances, candidates)[:candidates]
+
+    # Exact re-rank of the coarse candidates
+    scores = corpus[coarse] @ query
+    order = np.argsort(-scores)[:k]
+
+    return coarse[order]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--notes", type=int, default=50000)
+    parser.add_argument("--topics", type=int, default=500)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=100)
+    parser.add_argument("--noise", type=float, default=0.6)
+    parser.add_argument("--oversample", type=int, nargs="+", default=[1, 2, 4, 10, 16, 32])
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+
+    corpus, centers = make_corpus(rng, args.notes, args.topics, args.noise)
+    queries = make_queries(rng, centers, args.queries, args.noise)
+    codes = np.packbits(corpus > 0, axis=1)
+
+    print(
+        f"notes={args.notes} dim={DIM} k={args.k} queries={args.queries} "
+        f"float32={corpus.nbytes / 2**20:.1f} MiB bits={codes.nbytes / 2**20:.1f} MiB"
+    )
+
+    start = time.perf_counter()
+    truth = [set(exact_top_k(corpus, q, args.k)) for q in queries]
+    exact_ms = (time.perf_counter() - start) / len(queries) * 1000
+
+    print(f"{'path':>14} {'recall@k':>9} {'ms/query':>9}")
+    print(f"{'exact':>14} {1.0:>9.3f} {exact_ms:>9.2f}")
+
+    for oversample in args.oversample:
+        start = time.perf_counter()
+        found = [binary_top_k(corpus, codes, q, args.k, oversample) for q in queries]
+        elapsed_ms = (time.perf_counter() - start) / len(queries) * 1000
+
+        recall = np.mean([
+            len(truth[i].intersection(found[i])) / args.k
+            for i in range(len(queries))
+        ])
+
+        print(f"{'binary x' + str(oversample):>14} {recall:>9.3f} {elapsed_ms:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
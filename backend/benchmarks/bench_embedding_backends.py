@@ -0,0 +1,151 @@
+"""Compare the torch and ONNX int8 embedding backends.
+
+Each backend runs in its own spawned process so resident memory is
+measured in isolation. Reports load time, single-query latency, batch
+throughput, peak RSS and the cosine agreement of the ONNX vectors with
+the torch ones on a fixed sentence set. Export the ONNX model first
+(python -m scripts.export_onnx_model).
+
+Usage (from backend/):
+    python -m benchmarks.bench_embedding_backends --queries 200 --batch 32
+"""
+import argparse
+import multiprocessing
+import resource
+import time
+
+import numpy as np
+
+from app.core.config import EMBEDDING_MODEL_NAME
+
+
+SENTENCES = [
+    "Normalization removes redundancy from relational schemas.",
+    "What is the difference between 2NF and 3NF?",
+    "Dijkstra's algorithm finds shortest paths with non-negative weights.",
+    "Explain the time complexity of merge sort.",
+    "A B+ tree keeps all records in its leaf level.",
+    "TCP guarantees ordered, reliable delivery of a byte stream.",
+    "How does a hash join work?",
+    "Photosynthesis converts light energy into chemical energy.",
+    "The mitochondria is the powerhouse of the cell.",
+    "Newton's second law relates force, mass and acceleration.",
+    "Eigenvalues of a symmetric matrix are real.",
+    "Gradient descent minimizes a differentiable loss function.",
+    "Overfitting means the model memorizes the training data.",
+    "What causes a deadlock between two transactions?",
+    "Virtual memory maps pages to physical frames.",
+    "Round robin scheduling uses a fixed time quantum.",
+    "The French Revolution began in 1789.",
+    "Supply and demand determine the market price.",
+    "Ohm's law: voltage equals current times resistance.",
+    "Binary search requires a sorted array.",
+    "dbms unit 3 notes",
+    "operating systems previous year questions",
+    "Integration by parts comes from the product rule.",
+    "Entropy of an isolated system never decreases.",
+    "A compiler translates source code into machine code in several phases.",
+    "Recursion needs a base case to terminate.",
+    "The OSI model has seven layers.",
+    "Covalent bonds share electron pairs between atoms.",
+    "Write a short note on the Indus Valley civilization.",
+    "Big-O notation describes an upper bound on growth.",
+    "Primary keys uniquely identify rows in a table.",
+    "Convolutional networks share weights across spatial positions.",
+]
+
+
+def peak_rss_mib() -> float:
+    # ru_maxrss is KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_backend(backend: str, model: str, queries: int, batch: int):
+    baseline = peak_rss_mib()
+
+    from app.ml.embedding_model import load_encoder
+
+    start = time.perf_counter()
+    encoder = load_encoder(model, backend)
+    encoder.encode(["warm up"])
+    load_s = time.perf_counter() - start
+
+    latencies = []
+
+    for i in range(queries):
+        sentence = SENTENCES[i % len(SENTENCES)]
+        start = time.perf_counter()
+        encoder.encode([sentence])
+        latencies.append(time.perf_counter() - start)
+
+    texts = (SENTENCES * (batch * 8 // len(SENTENCES) + 1))[:batch * 8]
+
+    start = time.perf_counter()
+    encoder.encode(texts, batch_size=batch)
+    throughput = len(texts) / (time.perf_counter() - start)
+
+    return {
+        "load_s": load_s,
+        "p50_ms": float(np.percentile(latencies, 50) * 1000),
+        "p95_ms": float(np.percentile(latencies, 95) * 1000),
+        "throughput": throughput,
+        "rss_mib": peak_rss_mib(),
+        "rss_delta_mib": peak_rss_mib() - baseline,
+        "embeddings": np.asarray(encoder.encode(SENTENCES), dtype=np.float32)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model", default=EMBEDDING_MODEL_NAME)
+    parser.add_argument("--backends", nargs="+", default=["torch", "onnx"])
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--batch", type=int, default=32)
+    args = parser.parse_args()
+
+    context = multiprocessing.get_context("spawn")
+    results = {}
+
+    for backend in args.backends:
+        with context.Pool(1) as pool:
+            results[backend] = pool.apply(
+                run_backend,
+                (backend, args.model, args.queries, args.batch)
+            )
+
+    print(f"model={args.model} queries={args.queries} batch={args.batch}")
+    print(
+        f"{'backend':>8} {'load s':>7} {'p50 ms':>7} {'p95 ms':>7} "
+        f"{'texts/s':>8} {'peak RSS MiB':>13} {'model MiB':>10}"
+    )
+
+    for backend, r in results.items():
+        print(
+            f"{backend:>8} {r['load_s']:>7.2f} {r['p50_ms']:>7.2f} {r['p95_ms']:>7.2f} "
+            f"{r['throughput']:>8.0f} {r['rss_mib']:>13.0f} {r['rss_delta_mib']:>10.0f}"
+        )
+
+    if "torch" in results and "onnx" in results:
+        reference = results["torch"]["embeddings"]
+        candidate = results["onnx"]["embeddings"]
+
+        cosine = (reference * candidate).sum(axis=1) / (
+            np.linalg.norm(reference, axis=1) * np.linalg.norm(candidate, axis=1)
+        )
+
+        # Does every sentence keep the same nearest neighbour?
+        def neighbours(matrix):
+            scores = matrix @ matrix.T
+            np.fill_diagonal(scores, -np.inf)
+            return scores.argmax(axis=1)
+
+        agreement = np.mean(neighbours(reference) == neighbours(candidate))
+
+        print(
+            f"cosine(torch, onnx): mean={cosine.mean():.4f} min={cosine.min():.4f}; "
+            f"nearest-neighbour agreement={agreement:.2%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
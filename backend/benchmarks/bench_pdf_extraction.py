@@ -0,0 +1,92 @@
+"""Benchmark PDF text extraction on large synthetic PDFs.
+
+Compares the old whole-document concatenation with the budgeted,
+page-streaming extract_pdf on time and peak Python memory.
+
+Usage (from backend/):
+    python -m benchmarks.bench_pdf_extraction --pages 100 300 600
+"""
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+import fitz  # PyMuPDF
+
+from app.core.config import NOTE_TEXT_MAX_CHARS
+from app.utils.pdf_utils import extract_pdf
+
+
+LINE = "Normalization removes redundancy from relational schemas step by step. "
+
+
+def make_pdf(path: str, pages: int, lines_per_page: int = 45):
+    doc = fitz.open()
+
+    for i in range(pages):
+        page = doc.new_page()
+        page.insert_textbox(
+            page.rect + (36, 36, -36, -36),
+            f"Page {i + 1}\n" + LINE * lines_per_page,
+            fontsize=9
+        )
+
+    doc.save(path)
+    doc.close()
+
+
+def legacy_extract(file_path: str) -> str:
+    # Previous implementation: parse every page, then slice
+    text = ""
+    doc = fitz.open(file_path)
+
+    for page in doc:
+        text += page.get_text()
+
+    return text[:NOTE_TEXT_MAX_CHARS]
+
+
+def budgeted_extract(file_path: str) -> str:
+    return extract_pdf(file_path, NOTE_TEXT_MAX_CHARS).text
+
+
+def measure(fn, path: str, repeat: int):
+    timings = []
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(path)
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    fn(path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return min(timings), peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, nargs="+", default=[50, 200, 600])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"budget={NOTE_TEXT_MAX_CHARS} chars, best of {args.repeat}")
+    print(f"{'pages':>6} {'impl':>9} {'time ms':>10} {'peak KiB':>10}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for pages in args.pages:
+            path = os.path.join(tmp, f"synthetic_{pages}.pdf")
+            make_pdf(path, pages)
+
+            assert legacy_extract(path) == budgeted_extract(path)
+
+            for name, fn in (("legacy", legacy_extract), ("budgeted", budgeted_extract)):
+                seconds, peak = measure(fn, path, args.repeat)
+                print(f"{pages:>6} {name:>9} {seconds * 1000:>10.1f} {peak / 1024:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+"""Gunicorn settings for the API.
+
+With preload_app the master imports the app and loads the embedding
+model weights once; forked workers share them copy-on-write and only
+run their own warm-up encode (/health/ready turns 200 after it).
+
+Usage (from backend/):
+    gunicorn -c gunicorn.conf.py app.main:app
+"""
+import os
+
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+workers = int(os.getenv("WEB_CONCURRENCY", "2"))
+worker_class = "uvicorn.workers.UvicornWorker"
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "120"))
+
+preload_app = os.getenv("GUNICORN_PRELOAD", "true").lower() == "true"
+
+
+def on_starting(server):
+    if preload_app:
+        # Weights only: an encode here would start torch / tokenizer
+        # thread pools that don't survive fork
+        from app.ml.embedding_model import provider
+
+        provider.load()
+
+
+def post_fork(server, worker):
+    # Never share pooled DB sockets with the master
+    from app.db.session import engine
+
+    engine.dispose(close=False)
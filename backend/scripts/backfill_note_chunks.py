@@ -0,0 +1,36 @@
+"""Queue ready notes that have no passage chunks for re-ingestion.
+
+Usage (from backend/):
+    python -m scripts.backfill_note_chunks
+"""
+from sqlalchemy import text
+
+from app.db.session import SessionLocal
+
+
+def main():
+    db = SessionLocal()
+
+    try:
+        result = db.execute(text("""
+            INSERT INTO ingestion_jobs (id, note_id, status, attempts)
+            SELECT gen_random_uuid(), n.id, 'pending', 0
+            FROM notes n
+            WHERE n.status = 'ready'
+              AND NOT EXISTS (
+                  SELECT 1 FROM note_chunks c WHERE c.note_id = n.id
+              )
+            ON CONFLICT (note_id) DO UPDATE
+            SET status = 'pending', attempts = 0, error = NULL
+        """))
+
+        db.commit()
+
+        print(f"Queued {result.rowcount} notes for chunking")
+
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""Import a directory or zip archive of PDFs as notes owned by one user.
+
+Files are extracted across a process pool and encoded and inserted in
+batches, one commit per batch. Files the user already imported are
+skipped, so an interrupted import is resumed by running it again.
+
+Usage (from backend/):
+    python -m scripts.bulk_import archive.zip --email prof@uni.edu --subject DBMS
+    python -m scripts.bulk_import course/ --email prof@uni.edu --subject DBMS --public --report report.jsonl
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+
+from app.core.config import INGESTION_EXTRACT_PROCESSES, BULK_IMPORT_BATCH_SIZE
+from app.db.session import SessionLocal
+from app.models.user import User
+from app.services.blob_store import discard_incoming, receive_file
+from app.services.bulk_import import (
+    ImportOptions,
+    file_sha256,
+    find_imported,
+    import_result,
+    import_files
+)
+
+
+def iter_sources(path: str):
+    # (name, opener) for every PDF, in a stable order
+    if zipfile.is_zipfile(path):
+        # Closed once the import has gone through every member
+        with zipfile.ZipFile(path) as archive:
+            for info in sorted(archive.infolist(), key=lambda i: i.filename):
+                if not info.is_dir() and info.filename.lower().endswith(".pdf"):
+                    yield info.filename, lambda info=info: archive.open(info)
+        return
+
+    for root, dirs, files in os.walk(path):
+        dirs.sort()
+
+        for name in sorted(files):
+            if name.lower().endswith(".pdf"):
+                file_path = os.path.join(root, name)
+                yield os.path.relpath(file_path, path), lambda p=file_path: open(p, "rb")
+
+
+def batched(iterable, size: int):
+    batch = []
+
+    for item in iterable:
+        batch.append(item)
+
+        if len(batch) == size:
+            yield batch
+            batch = []
+
+    if batch:
+        yield batch
+
+
+def import_batch(db, batch, user_id: int, options: ImportOptions, executor):
+    hashes = {}
+
+    for name, opener in batch:
+        with opener() as f:
+            hashes[name] = file_sha256(f)
+
+    # Only files not imported yet are copied into the blob store
+    imported = find_imported(db, user_id, set(hashes.values()))
+
+    results = [
+        import_result(name, "skipped", imported[hashes[name]], "Already imported")
+        for name, _ in batch
+        if hashes[name] in imported
+    ]
+
+    stored_files = []
+
+    for name, opener in batch:
+        if hashes[name] not in imported:
+            with opener() as f:
+                # Local files: no upload size limit
+                stored_files.append(receive_file(f, name, max_bytes=None))
+
+    try:
+        results.extend(import_files(db, stored_files, user_id, options, executor))
+        db.commit()
+
+    except Exception:
+        # Blobs already moved into place go with the rollback; this drops
+        # the incoming copies that weren't retained
+        db.rollback()
+
+        for stored in stored_files:
+            discard_incoming(stored)
+
+        raise
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path", help="directory or .zip archive")
+    parser.add_argument("--email", required=True, help="owner of the imported notes")
+    parser.add_argument("--subject", required=True)
+    parser.add_argument("--content-type", default="notes")
+    parser.add_argument("--description", default="")
+    parser.add_argument("--public", action="store_true")
+    parser.add_argument("--batch-size", type=int, default=BULK_IMPORT_BATCH_SIZE)
+    parser.add_argument("--processes", type=int, default=INGESTION_EXTRACT_PROCESSES)
+    parser.add_argument("--report", help="append per-file results to this JSONL file")
+    args = parser.parse_args()
+
+    options = ImportOptions(
+        subject=args.subject,
+        content_type=args.content_type,
+        description=args.description,
+        is_private=not args.public
+    )
+
+    db = SessionLocal()
+    report = open(args.report, "a") if args.report else None
+    counts = {}
+
+    # spawn, not fork: this process holds the model and DB sockets
+    executor = ProcessPoolExecutor(
+        max_workers=args.processes,
+        mp_context=multiprocessing.get_context("spawn")
+    )
+
+    try:
+        user = db.query(User).filter(User.email == args.email).first()
+
+        if user is None:
+            parser.error(f"No user with email {args.email}")
+
+        user_id = user.id
+
+        for batch in batched(iter_sources(args.path), args.batch_size):
+            for result in import_batch(db, batch, user_id, options, executor):
+                counts[result["status"]] = counts.get(result["status"], 0) + 1
+
+                if result["status"] == "failed":
+                    print(f"FAILED {result['source']}: {result['error']}")
+
+                if report is not None:
+                    report.write(json.dumps(result) + "\n")
+
+            if report is not None:
+                report.flush()
+
+            print(", ".join(f"{status}={count}" for status, count in sorted(counts.items())))
+
+    finally:
+        executor.shutdown()
+        db.close()
+
+        if report is not None:
+            report.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""Serve embeddings to every API / ingestion process on this host.
+
+Owns the only copy of the model. Requests from all clients go through a
+single batcher, so concurrent encodes from different workers share one
+forward pass. Point the workers at it with EMBEDDING_SERVICE_SOCKET.
+
+Usage (from backend/):
+    python -m scripts.embedding_server --socket /run/nexlearn/embeddings.sock
+"""
+import argparse
+import logging
+import os
+import signal
+import threading
+
+from app.core.config import EMBEDDING_SERVICE_SOCKET
+from app.ml.embedding_model import encode_in_process, model_name
+from app.ml.embedding_service import EmbeddingServer
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--socket", default=EMBEDDING_SERVICE_SOCKET)
+    args = parser.parse_args()
+
+    if not args.socket:
+        parser.error("--socket (or EMBEDDING_SERVICE_SOCKET) is required")
+
+    logging.basicConfig(level=logging.INFO)
+
+    # Load and warm up before accepting connections
+    encode_in_process(["warm up"])
+
+    server = EmbeddingServer(args.socket, encode_in_process)
+
+    signal.signal(signal.SIGTERM, lambda *_: threading.Thread(target=server.shutdown).start())
+    signal.signal(signal.SIGINT, lambda *_: threading.Thread(target=server.shutdown).start())
+
+    print(f"Embedding server for {model_name} listening on {args.socket}")
+
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+
+        if os.path.exists(args.socket):
+            os.remove(args.socket)
+
+
+if __name__ == "__main__":
+    main()
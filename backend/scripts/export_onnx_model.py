@@ -0,0 +1,101 @@
+"""Export a sentence-transformers model to ONNX with dynamic int8 quantization.
+
+Writes <output>/<model>/ with the fp32 and int8 graphs, tokenizer.json
+and the pooling settings read by app.ml.onnx_encoder. Serve it with
+EMBEDDING_BACKEND=onnx (and the same ONNX_MODEL_DIR). Needs torch and
+sentence-transformers (installed for the torch backend) plus onnxruntime.
+
+Usage (from backend/):
+    python -m scripts.export_onnx_model
+    python -m scripts.export_onnx_model --model all-MiniLM-L6-v2 --output models/onnx
+"""
+import argparse
+import json
+import os
+
+from app.core.config import EMBEDDING_MODEL_NAME, ONNX_MODEL_DIR
+from app.ml.onnx_encoder import CONFIG_FILE, model_dir
+
+
+FP32_FILE = "model.onnx"
+INT8_FILE = "model_int8.onnx"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model", default=EMBEDDING_MODEL_NAME)
+    parser.add_argument("--output", default=ONNX_MODEL_DIR)
+    parser.add_argument("--opset", type=int, default=17)
+    parser.add_argument("--no-quantize", action="store_true", help="serve the fp32 graph")
+    args = parser.parse_args()
+
+    import torch
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+    from sentence_transformers import SentenceTransformer
+    from sentence_transformers.models import Normalize, Pooling
+
+    st = SentenceTransformer(args.model, device="cpu")
+
+    transformer = st[0]
+    pooling = next(m for m in st if isinstance(m, Pooling))
+
+    # OnnxEncoder reproduces mean pooling (+ optional normalization) only
+    if pooling.get_pooling_mode_str() != "mean" or len(st) > 3:
+        parser.error(f"{args.model}: only mean-pooled models are supported")
+
+    output = model_dir(args.model, args.output)
+    os.makedirs(output, exist_ok=True)
+
+    tokenizer = transformer.tokenizer
+    input_names = [
+        name for name in ("input_ids", "attention_mask", "token_type_ids")
+        if name in tokenizer.model_input_names
+    ]
+
+    sample = tokenizer(["export sample"], return_tensors="pt")
+
+    transformer.auto_model.eval()
+
+    with torch.no_grad():
+        torch.onnx.export(
+            transformer.auto_model,
+            tuple(sample[name] for name in input_names),
+            os.path.join(output, FP32_FILE),
+            input_names=input_names,
+            output_names=["last_hidden_state"],
+            dynamic_axes={
+                **{name: {0: "batch", 1: "sequence"} for name in input_names},
+                "last_hidden_state": {0: "batch", 1: "sequence"}
+            },
+            opset_version=args.opset
+        )
+
+    if not args.no_quantize:
+        # int8 weights for the MatMul / Gemm layers, activations quantized
+        # on the fly: no calibration data needed
+        quantize_dynamic(
+            os.path.join(output, FP32_FILE),
+            os.path.join(output, INT8_FILE),
+            weight_type=QuantType.QInt8
+        )
+
+    # tokenizer.json, loaded by the tokenizers library without transformers
+    tokenizer.save_pretrained(output)
+
+    with open(os.path.join(output, CONFIG_FILE), "w") as f:
+        json.dump({
+            "model_name": args.model,
+            "model_file": FP32_FILE if args.no_quantize else INT8_FILE,
+            "dimension": st.get_sentence_embedding_dimension(),
+            "max_seq_length": st.max_seq_length,
+            "normalize": any(isinstance(m, Normalize) for m in st),
+            "pad_token": tokenizer.pad_token,
+            "pad_token_id": tokenizer.pad_token_id
+        }, f, indent=2)
+
+    size = os.path.getsize(os.path.join(output, FP32_FILE if args.no_quantize else INT8_FILE))
+    print(f"Exported {args.model} to {output} ({size / 2**20:.1f} MiB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""Run note ingestion workers outside the API processes.
+
+Usage (from backend/):
+    DB_POOL_PROFILE=worker python -m scripts.ingestion_worker --threads 2 --processes 4
+"""
+import argparse
+import logging
+import signal
+import threading
+
+from app.core.config import (
+    INGESTION_WORKER_THREADS,
+    INGESTION_EXTRACT_PROCESSES,
+    INGESTION_BATCH_SIZE
+)
+from app.services.ingestion import IngestionWorker
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--threads", type=int, default=INGESTION_WORKER_THREADS)
+    parser.add_argument("--processes", type=int, default=INGESTION_EXTRACT_PROCESSES)
+    parser.add_argument("--batch-size", type=int, default=INGESTION_BATCH_SIZE)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+
+    worker = IngestionWorker(
+        threads=args.threads,
+        processes=args.processes,
+        batch_size=args.batch_size
+    )
+
+    stopped = threading.Event()
+
+    signal.signal(signal.SIGTERM, lambda *_: stopped.set())
+    signal.signal(signal.SIGINT, lambda *_: stopped.set())
+
+    worker.start()
+    print(f"Ingestion worker running ({args.threads} threads, {args.processes} processes)")
+
+    stopped.wait()
+    worker.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""Rebuild an HNSW vector index (notes.embedding by default).
+
+Usage (from backend/):
+    python -m scripts.rebuild_vector_index
+    python -m scripts.rebuild_vector_index --m 24 --ef-construction 128
+    python -m scripts.rebuild_vector_index --index ix_note_chunks_embedding_hnsw
+"""
+import argparse
+
+from app.core.config import HNSW_M, HNSW_EF_CONSTRUCTION
+from app.db.session import engine
+from app.db.vector_index import NOTES_EMBEDDING_INDEX, VECTOR_INDEXES, rebuild_index
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--index", choices=sorted(VECTOR_INDEXES), default=NOTES_EMBEDDING_INDEX)
+    parser.add_argument("--m", type=int, default=HNSW_M)
+    parser.add_argument("--ef-construction", type=int, default=HNSW_EF_CONSTRUCTION)
+    args = parser.parse_args()
+
+    table, column = VECTOR_INDEXES[args.index]
+
+    action = rebuild_index(
+        engine,
+        index_name=args.index,
+        table=table,
+        column=column,
+        m=args.m,
+        ef_construction=args.ef_construction
+    )
+
+    print(
+        f"{args.index}: {action} "
+        f"(m={args.m}, ef_construction={args.ef_construction})"
+    )
+
+
+if __name__ == "__main__":
+    main()
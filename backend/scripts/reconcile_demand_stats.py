@@ -0,0 +1,22 @@
+"""Recompute challenge demand counters from demand_logs.
+
+Usage (from backend/):
+    python -m scripts.reconcile_demand_stats
+"""
+from app.db.session import SessionLocal
+from app.services.demand_stats import reconcile_demand_stats
+
+
+def main():
+    db = SessionLocal()
+
+    try:
+        updated = reconcile_demand_stats(db)
+        print(f"Reconciled {updated} challenges")
+
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
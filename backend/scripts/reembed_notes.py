@@ -0,0 +1,115 @@
+"""Re-embed every note and passage with another model, without downtime.
+
+Vectors are written to a shadow column (embedding_next) in keyset
+batches from the stored extracted text, then the HNSW indexes are built
+concurrently and the shadow column is swapped in with the active model
+in one transaction. Progress is checkpointed per batch: stop it at any
+time and run the same command again to resume.
+
+API workers follow the switch on their next search (loading the new
+model on first use). If its dimension differs, roll the API and
+ingestion workers with the new EMBEDDING_MODEL_NAME / EMBEDDING_DIM.
+
+Usage (from backend/):
+    python -m scripts.reembed_notes --model all-mpnet-base-v2
+    python -m scripts.reembed_notes --model all-mpnet-base-v2 --no-switch
+    python -m scripts.reembed_notes --status
+    python -m scripts.reembed_notes --abort
+    python -m scripts.reembed_notes --drop-previous
+"""
+import argparse
+
+from app.core.config import REEMBED_BATCH_SIZE
+from app.db.session import SessionLocal, engine
+from app.models.embedding_migration import EmbeddingMigration
+from app.services.embedding_migration import (
+    MigrationError,
+    abort,
+    backfill,
+    build_indexes,
+    drop_previous,
+    get_migration,
+    start_migration,
+    switch
+)
+
+
+def print_status(db):
+    for migration in db.query(EmbeddingMigration).order_by(EmbeddingMigration.id):
+        print(
+            f"{migration.id:>4} {migration.status:<12} {migration.model_name} "
+            f"dim={migration.dimensions} processed={migration.processed}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model", help="sentence-transformers model name")
+    parser.add_argument("--batch-size", type=int, default=REEMBED_BATCH_SIZE)
+    parser.add_argument("--no-switch", action="store_true", help="stop once the shadow column is indexed")
+    parser.add_argument("--status", action="store_true")
+    parser.add_argument("--abort", action="store_true", help="drop the shadow column of the running migration")
+    parser.add_argument("--drop-previous", action="store_true", help="drop the vectors replaced by the last switch")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+
+    try:
+        if args.status:
+            print_status(db)
+            return
+
+        if args.abort:
+            migration = get_migration(db)
+
+            if migration is None:
+                parser.error("No migration in progress")
+
+            abort(db, migration)
+            print(f"Aborted migration to {migration.model_name}")
+            return
+
+        if args.drop_previous:
+            drop_previous(db)
+            print("Dropped previous embedding columns")
+            return
+
+        if not args.model:
+            parser.error("--model is required")
+
+        # Imported here: loads torch and the model weights
+        from app.ml.embedding_model import get_model
+
+        dimensions = get_model(args.model).get_sentence_embedding_dimension()
+
+        try:
+            migration = start_migration(db, args.model, dimensions)
+        except MigrationError as e:
+            parser.error(str(e))
+
+        if migration.status == "backfilling":
+            print(f"Backfilling {args.model} (dim={dimensions}) from note {migration.cursor or 'start'}")
+
+            backfill(
+                db,
+                migration,
+                batch_size=args.batch_size,
+                progress=lambda done: print(f"  {done} notes")
+            )
+
+        if migration.status == "indexing":
+            print("Building indexes on the shadow column")
+            build_indexes(engine, db, migration)
+
+        if migration.status == "ready" and not args.no_switch:
+            switch(db, migration, batch_size=args.batch_size)
+            print(f"Switched search to {args.model}")
+
+        print_status(db)
+
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()